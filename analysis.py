@@ -4,9 +4,12 @@
 Предоставляет методы для анализа данных и генерации отчетов.
 """
 from typing import List, Dict, Tuple
+from collections import Counter, defaultdict
+from functools import wraps
 import sqlite3
 from datetime import datetime
-import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_agg import FigureCanvasAgg
 import pandas as pd
 import networkx as nx
@@ -14,6 +17,55 @@ import seaborn as sns
 
 from models import Customer, Product, Order
 
+def _memoized(method):
+    """Кэширование результата метода DataAnalyzer до изменения данных в базе.
+
+    Ключ кэша — имя метода и аргументы; весь кэш сбрасывается, когда
+    меняется версия данных ``db.get_data_version()``.
+
+    Повторные вызовы возвращают тот же объект (список, словарь или
+    DataFrame), а не копию, поэтому результаты get_* предназначены
+    только для чтения: изменения в них видны следующим вызовам.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        version = self.db.get_data_version()
+        if version != self._memo_version:
+            self._memo.clear()
+            self._memo_version = version
+        
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        if key not in self._memo:
+            self._memo[key] = method(self, *args, **kwargs)
+        return self._memo[key]
+    return wrapper
+
+def _plot(method):
+    """Повторный вызов plot_* метода без перерисовки.
+
+    Если единственная фигура уже содержит этот график для текущей
+    версии данных, она возвращается как есть.
+    """
+    @wraps(method)
+    def wrapper(self):
+        key = (method.__name__, self.db.get_data_version())
+        if self._figure is None or self._figure_key != key:
+            self._figure_key = None
+            method(self)
+            self._figure_key = key
+        return self._figure
+    return wrapper
+
+def _positions(ids: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    """Позиции ``keys`` в массиве ``ids``; отсутствующим ключам — ``len(ids)``."""
+    n = len(ids)
+    if n == 0:
+        return np.zeros(len(keys), dtype=np.intp)
+    
+    sorter = np.argsort(ids, kind='stable')
+    ix = sorter[np.minimum(np.searchsorted(ids, keys, sorter=sorter), n - 1)]
+    return np.where(ids[ix] == keys, ix, n)
+
 class DataAnalyzer:
     """Класс для анализа и визуализации данных."""
     
@@ -25,7 +77,77 @@ class DataAnalyzer:
             Экземпляр базы данных для анализа
         """
         self.db = db
+        
+        # Кэш результатов get_* и версия данных, для которой он собран
+        self._memo: Dict[tuple, object] = {}
+        self._memo_version = None
+        
+        # Единственная фигура, переиспользуемая всеми plot_* методами,
+        # и ключ (метод, версия данных) нарисованного на ней графика
+        self._figure = None
+        self._figure_key = None
+    
+    def _get_figure(self, figsize: Tuple[float, float]) -> Figure:
+        """Очищенная фигура заданного размера для построения графика.
+
+        Фигура создаётся без pyplot (и без интерактивного бэкенда) один
+        раз и переиспользуется, поэтому предыдущий график, полученный
+        от plot_* методов, перерисовывается при следующем вызове.
+        """
+        if self._figure is None:
+            self._figure = Figure(figsize=figsize)
+            FigureCanvasAgg(self._figure)
+        else:
+            self._figure.clear()
+            self._figure.set_size_inches(figsize)
+        return self._figure
     
+    @_memoized
+    def _get_columns(self) -> Dict[str, np.ndarray]:
+        """Заказы и их позиции в виде столбцов NumPy.
+
+        Заказы обходятся один раз на версию данных через
+        ``db.iter_orders()``: от каждого заказа сохраняются только
+        нужные числа, а список объектов всех заказов не строится. Все
+        агрегаты считаются дальше по этим массивам.
+
+        Returns
+        -------
+        Dict[str, np.ndarray]
+            'order_customer', 'order_amount', 'order_date' — по заказам;
+            'item_customer', 'item_product', 'item_quantity',
+            'item_revenue' — по позициям заказов
+        """
+        order_rows = []
+        item_rows = []
+        for order in self.db.iter_orders():
+            customer_id = order.customer.customer_id
+            # Дата с часовым поясом берётся по местному времени заказа:
+            # datetime64 перевёл бы её в UTC и мог сдвинуть на соседний день
+            order_rows.append((customer_id, order.total_amount,
+                               order.date.replace(tzinfo=None)))
+            item_rows.extend((customer_id, item.product.product_id,
+                              item.quantity, item.total_price)
+                             for item in order.items)
+        
+        def column(rows, i, dtype):
+            return np.fromiter((row[i] for row in rows), dtype=dtype, count=len(rows))
+        
+        columns = {
+            'order_customer': column(order_rows, 0, np.int64),
+            'order_amount': column(order_rows, 1, np.float64),
+            'order_date': np.array([row[2] for row in order_rows], dtype='datetime64[us]'),
+            'item_customer': column(item_rows, 0, np.int64),
+            'item_product': column(item_rows, 1, np.int64),
+            'item_quantity': column(item_rows, 2, np.float64),
+            'item_revenue': column(item_rows, 3, np.float64)
+        }
+        # Столбцы общие для всех вызовов в пределах версии данных
+        for array in columns.values():
+            array.flags.writeable = False
+        return columns
+    
+    @_memoized
     def get_top_customers(self, n: int = 5) -> List[Tuple[Customer, int, float]]:
         """
         Получение топ-N клиентов по количеству заказов и общей сумме.
@@ -41,19 +163,23 @@ class DataAnalyzer:
             Список кортежей (клиент, количество заказов, общая сумма)
         """
         customers = self.db.get_all_customers()
-        orders = self.db.get_all_orders()
+        columns = self._get_columns()
         
-        customer_stats = []
-        for customer in customers:
-            customer_orders = [o for o in orders if o.customer.customer_id == customer.customer_id]
-            total_spent = sum(o.total_amount for o in customer_orders)
-            customer_stats.append((customer, len(customer_orders), total_spent))
+        # Индексы клиентов в массивах агрегатов; заказы неизвестных
+        # клиентов собираются в последнюю, лишнюю ячейку
+        customer_ids = np.fromiter((c.customer_id for c in customers),
+                                   dtype=np.int64, count=len(customers))
+        size = len(customers) + 1
+        ixs = _positions(customer_ids, columns['order_customer'])
         
-        # Сортировка по количеству заказов (по убыванию)
-        customer_stats.sort(key=lambda x: x[1], reverse=True)
+        counts = np.bincount(ixs, minlength=size)[:-1]
+        totals = np.bincount(ixs, weights=columns['order_amount'], minlength=size)[:-1]
         
-        return customer_stats[:n]
+        # Топ-N по количеству заказов (по убыванию, при равенстве — в исходном порядке)
+        top = np.argsort(-counts, kind='stable')[:n]
+        return [(customers[i], int(counts[i]), float(totals[i])) for i in top]
     
+    @_memoized
     def get_sales_trend(self, period: str = 'D') -> pd.DataFrame:
         """
         Получение динамики продаж по периодам.
@@ -68,28 +194,24 @@ class DataAnalyzer:
         pd.DataFrame
             DataFrame с колонками: date, orders_count, total_amount
         """
-        orders = self.db.get_all_orders()
+        columns = self._get_columns()
         
-        data = []
-        for order in orders:
-            data.append({
-                'date': order.date.date(),
+        # DataFrame строится по колонкам; разбиение по дням, неделям
+        # и месяцам выполняет resample, поэтому усекать даты не нужно
+        df = pd.DataFrame(
+            {
                 'orders_count': 1,
-                'total_amount': order.total_amount
-            })
-        
-        df = pd.DataFrame(data)
-        df['date'] = pd.to_datetime(df['date'])
-        df = df.set_index('date')
+                'total_amount': columns['order_amount']
+            },
+            index=pd.DatetimeIndex(columns['order_date'], name='date')
+        )
         
         # Группировка по периоду
-        trend = df.resample(period).agg({
-            'orders_count': 'sum',
-            'total_amount': 'sum'
-        }).reset_index()
+        trend = df.resample(period).sum().reset_index()
         
         return trend
     
+    @_memoized
     def get_top_products(self, n: int = 5) -> List[Tuple[Product, int, float]]:
         """
         Получение топ-N товаров по количеству продаж и общей выручке.
@@ -104,25 +226,23 @@ class DataAnalyzer:
         List[Tuple[Product, int, float]]
             Список кортежей (товар, количество продаж, общая выручка)
         """
-        orders = self.db.get_all_orders()
         products = self.db.get_all_products()
+        columns = self._get_columns()
         
-        product_stats = {p.product_id: {'product': p, 'quantity': 0, 'revenue': 0.0} 
-                        for p in products}
-        
-        for order in orders:
-            for item in order.items:
-                pid = item.product.product_id
-                product_stats[pid]['quantity'] += item.quantity
-                product_stats[pid]['revenue'] += item.total_price
+        # Позиции с неизвестными товарами собираются в последнюю, лишнюю ячейку
+        product_ids = np.fromiter((p.product_id for p in products),
+                                  dtype=np.int64, count=len(products))
+        size = len(products) + 1
+        ixs = _positions(product_ids, columns['item_product'])
         
-        # Преобразование в список и сортировка по количеству продаж
-        stats_list = [(v['product'], v['quantity'], v['revenue']) 
-                     for v in product_stats.values()]
-        stats_list.sort(key=lambda x: x[1], reverse=True)
+        quantity = np.bincount(ixs, weights=columns['item_quantity'], minlength=size)[:-1]
+        revenue = np.bincount(ixs, weights=columns['item_revenue'], minlength=size)[:-1]
         
-        return stats_list[:n]
+        # Топ-N по количеству продаж; товары без продаж тоже участвуют
+        top = np.argsort(-quantity, kind='stable')[:n]
+        return [(products[i], int(quantity[i]), float(revenue[i])) for i in top]
     
+    @_memoized
     def get_customer_connections(self) -> Dict[str, List[Tuple[int, int]]]:
         """
         Получение связей между клиентами (по общим товарам).
@@ -135,40 +255,44 @@ class DataAnalyzer:
             - 'edges': список кортежей (id1, id2, weight)
         """
         customers = self.db.get_all_customers()
-        orders = self.db.get_all_orders()
-        
-        # Собираем товары для каждого клиента
-        customer_products = {}
-        for customer in customers:
-            customer_orders = [o for o in orders if o.customer.customer_id == customer.customer_id]
-            products = set()
-            for order in customer_orders:
-                for item in order.items:
-                    products.add(item.product.product_id)
-            customer_products[customer.customer_id] = products
-        
-        # Находим связи между клиентами (по общим товарам)
-        connections = []
-        customer_ids = list(customer_products.keys())
-        
-        for i in range(len(customer_ids)):
-            for j in range(i + 1, len(customer_ids)):
-                id1 = customer_ids[i]
-                id2 = customer_ids[j]
-                common = customer_products[id1] & customer_products[id2]
-                if common:
-                    connections.append((id1, id2, len(common)))
+        columns = self._get_columns()
+        
+        # Инвертированный индекс: товар -> клиенты, которые его покупали;
+        # повторные покупки схлопываются через np.unique по парам
+        known_ids = np.fromiter((c.customer_id for c in customers),
+                                dtype=np.int64, count=len(customers))
+        known = np.isin(columns['item_customer'], known_ids)
+        pairs = np.unique(np.stack([columns['item_product'][known],
+                                    columns['item_customer'][known]], axis=1), axis=0)
+        by_product = defaultdict(set)
+        for pid, cid in pairs.tolist():
+            by_product[pid].add(cid)
+        
+        # Пары клиентов порождаются только из товаров, купленных хотя бы
+        # двумя клиентами, поэтому пары без общих товаров не перебираются
+        edges = Counter()
+        for cids in by_product.values():
+            if len(cids) < 2:
+                continue
+            cids = sorted(cids)
+            for i, id1 in enumerate(cids):
+                for id2 in cids[i + 1:]:
+                    edges[(id1, id2)] += 1
+        
+        connections = [(id1, id2, weight) for (id1, id2), weight in edges.items()]
         
         return {
             'nodes': [(c.customer_id, c.name) for c in customers],
             'edges': connections
         }
     
+    @_plot
     def plot_top_customers(self):
         """Построение графика топ клиентов."""
         top_customers = self.get_top_customers()
         
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+        fig = self._get_figure((12, 5))
+        ax1, ax2 = fig.subplots(1, 2)
         fig.suptitle('Топ клиентов')
         
         # График по количеству заказов
@@ -188,14 +312,16 @@ class DataAnalyzer:
         ax2.set_ylabel('Сумма заказов')
         ax2.tick_params(axis='x', rotation=45)
         
-        plt.tight_layout()
+        fig.tight_layout()
         return fig
     
+    @_plot
     def plot_sales_trend(self):
         """Построение графика динамики продаж."""
         trend = self.get_sales_trend('W')  # По неделям
         
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8))
+        fig = self._get_figure((10, 8))
+        ax1, ax2 = fig.subplots(2, 1)
         fig.suptitle('Динамика продаж')
         
         # График количества заказов
@@ -210,14 +336,16 @@ class DataAnalyzer:
         ax2.set_ylabel('Сумма в неделю')
         ax2.grid(True)
         
-        plt.tight_layout()
+        fig.tight_layout()
         return fig
     
+    @_plot
     def plot_top_products(self):
         """Построение графика топ товаров."""
         top_products = self.get_top_products()
         
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+        fig = self._get_figure((12, 5))
+        ax1, ax2 = fig.subplots(1, 2)
         fig.suptitle('Топ товаров')
         
         # График по количеству продаж
@@ -237,40 +365,38 @@ class DataAnalyzer:
         ax2.set_ylabel('Общая выручка')
         ax2.tick_params(axis='x', rotation=45)
         
-        plt.tight_layout()
+        fig.tight_layout()
         return fig
     
+    @_plot
     def plot_customer_graph(self):
         """Построение графа связей клиентов."""
         graph_data = self.get_customer_connections()
         
-        fig = plt.figure(figsize=(10, 8))
-        plt.title('Граф связей клиентов (по общим товарам)')
+        fig = self._get_figure((10, 8))
+        ax = fig.subplots()
+        ax.set_title('Граф связей клиентов (по общим товарам)')
         
+        # Узлы и рёбра добавляются пакетно
         G = nx.Graph()
-        
-        # Добавление узлов
-        for node_id, node_name in graph_data['nodes']:
-            G.add_node(node_id, name=node_name)
-        
-        # Добавление рёбер
-        for id1, id2, weight in graph_data['edges']:
-            G.add_edge(id1, id2, weight=weight)
+        G.add_nodes_from((node_id, {'name': node_name})
+                         for node_id, node_name in graph_data['nodes'])
+        G.add_weighted_edges_from(graph_data['edges'])
         
         # Визуализация графа
         pos = nx.spring_layout(G, k=0.5, iterations=50)
         
         # Узлы
-        nx.draw_networkx_nodes(G, pos, node_size=700, node_color='lightblue')
+        nx.draw_networkx_nodes(G, pos, node_size=700, node_color='lightblue', ax=ax)
         
         # Рёбра
-        nx.draw_networkx_edges(G, pos, width=1.5, alpha=0.5)
+        nx.draw_networkx_edges(G, pos, width=1.5, alpha=0.5, ax=ax)
         
         # Подписи
         labels = {node_id: f"{node_id}\n{data['name']}" 
                 for node_id, data in G.nodes(data=True)}
-        nx.draw_networkx_labels(G, pos, labels, font_size=10)
+        nx.draw_networkx_labels(G, pos, labels, font_size=10, ax=ax)
         
-        plt.axis('off')
-        plt.tight_layout()
+        ax.axis('off')
+        fig.tight_layout()
         return fig
\ No newline at end of file
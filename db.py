@@ -1,17 +1,45 @@
 """
 Модуль работы с базой данных.
 
-Обеспечивает сохранение, загрузку и управление данными в JSON-файлах.
+Обеспечивает сохранение, загрузку и управление данными в JSONL-файлах
+(одна JSON-запись на строку), что позволяет добавлять записи дозаписью
+в конец файла без перезаписи всего файла.
 """
 import os
 import json
 import csv
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 
 from models import Customer, Product, Order, OrderItem
 
+try:
+    import orjson
+except ImportError:  # orjson необязателен, без него используется json
+    orjson = None
+
+def json_loads(raw: bytes) -> Any:
+    """Разбор JSON из байтов через orjson, если он установлен."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Сериализация в JSON (UTF-8) через orjson, если он установлен."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=4 if indent else None, ensure_ascii=False).encode('utf-8')
+
+def _file_key(file_path: Path) -> Tuple[int, int]:
+    """Ключ состояния файла на диске: время модификации (нс) и размер.
+
+    Размер отличает записи, попавшие в один такт времени модификации.
+    """
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
 class Database:
     """Класс для работы с данными в CSV/JSON форматах."""
     
@@ -26,72 +54,213 @@ class Database:
         self.data_dir.mkdir(exist_ok=True)
         
         # Файлы для хранения данных
-        self.customers_file = self.data_dir / 'customers.json'
-        self.products_file = self.data_dir / 'products.json'
-        self.orders_file = self.data_dir / 'orders.json'
+        self.customers_file = self.data_dir / 'customers.jsonl'
+        self.products_file = self.data_dir / 'products.jsonl'
+        self.orders_file = self.data_dir / 'orders.jsonl'
+        
+        # Кэш прочитанных файлов: путь -> (ключ _file_key, данные)
+        self._cache: Dict[Path, Tuple[Tuple[int, int], List[Dict]]] = {}
+        # Индексы записей по ID: путь -> (список-источник, индекс)
+        self._index_cache: Dict[Path, Tuple[List[Dict], Dict[int, Dict]]] = {}
+        # Сводная статистика: (версия данных, статистика)
+        self._stats_cache: Optional[Tuple[tuple, Dict[str, Any]]] = None
+        # Следующий свободный ID заказа: (ключ файла заказов, ID)
+        self._next_order_id: Optional[Tuple[Tuple[int, int], int]] = None
+        # Счётчик записей этого экземпляра, входит в версию данных
+        self._writes = 0
         
         # Инициализация файлов, если они не существуют
         self._init_files()
     
     def _init_files(self):
-        """Инициализация файлов с пустыми данными."""
-        if not self.customers_file.exists():
-            self._save_data([], self.customers_file)
-        
-        if not self.products_file.exists():
-            self._save_data([], self.products_file)
-        
-        if not self.orders_file.exists():
-            self._save_data([], self.orders_file)
+        """Инициализация файлов.
+
+        Отсутствующий файл создаётся из одноимённого JSON-файла прежнего
+        формата, если он есть, иначе — пустым. Старый файл не удаляется.
+        """
+        for file_path in (self.customers_file, self.products_file, self.orders_file):
+            if not file_path.exists():
+                legacy_file = file_path.with_suffix('.json')
+                data = self._load_data(legacy_file) if legacy_file.exists() else []
+                self._save_data(data, file_path)
     
     def _load_data(self, file_path: Path) -> List[Dict]:
-        """Загрузка данных из файла."""
+        """Загрузка данных из файла.
+
+        Результат кэшируется по времени модификации и размеру файла:
+        пока файл не изменился на диске, повторные вызовы возвращают уже
+        разобранные данные без чтения и парсинга.
+        """
+        try:
+            key = _file_key(file_path)
+        except FileNotFoundError:
+            self._cache.pop(file_path, None)
+            return []
+        
+        cached = self._cache.get(file_path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                if file_path.suffix == '.json':
-                    return json.load(f)
-                elif file_path.suffix == '.csv':
-                    return list(csv.DictReader(f))
+            if file_path.suffix == '.jsonl':
+                data = [json_loads(line) for line in file_path.read_bytes().splitlines()
+                        if line.strip()]
+            elif file_path.suffix == '.json':
+                data = json_loads(file_path.read_bytes())
+            elif file_path.suffix == '.csv':
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    data = list(csv.DictReader(f))
+            else:
+                return []
         except (FileNotFoundError, json.JSONDecodeError):
             return []
+        
+        self._cache[file_path] = (key, data)
+        return data
     
     def _save_data(self, data: List[Dict], file_path: Path):
-        """Сохранение данных в файл."""
-        with open(file_path, 'w', encoding='utf-8') as f:
-            if file_path.suffix == '.json':
-                json.dump(data, f, indent=4, ensure_ascii=False)
-            elif file_path.suffix == '.csv':
+        """Сохранение данных в файл базы с обновлением кэша и версии данных."""
+        self._write_file(data, file_path)
+        
+        # Записанные данные сразу попадают в кэш, чтобы следующее
+        # чтение не обращалось к диску
+        self._cache[file_path] = (_file_key(file_path), data)
+        self._index_cache.pop(file_path, None)
+        self._writes += 1
+        if file_path == self.orders_file:
+            self._next_order_id = None
+    
+    @staticmethod
+    def _write_file(data: List[Dict], file_path: Path):
+        """Запись данных в файл в формате по его расширению.
+
+        Кэш и версия данных не меняются, поэтому так пишутся и файлы
+        экспорта, не относящиеся к базе.
+        """
+        if file_path.suffix == '.jsonl':
+            file_path.write_bytes(b''.join(json_dumps(record) + b'\n' for record in data))
+        elif file_path.suffix == '.json':
+            file_path.write_bytes(json_dumps(data, indent=True))
+        elif file_path.suffix == '.csv':
+            with open(file_path, 'w', encoding='utf-8') as f:
                 if data:
                     writer = csv.DictWriter(f, fieldnames=data[0].keys())
                     writer.writeheader()
                     writer.writerows(data)
     
+    def _append_data(self, records: List[Dict], file_path: Path):
+        """Дозапись записей в конец JSONL-файла одной операцией записи.
+
+        Если кэш файла актуален, записи добавляются и в него, так что
+        следующее чтение не разбирает файл заново. Так же продвигается
+        закэшированный следующий ID заказа.
+        """
+        try:
+            old_key = _file_key(file_path)
+        except FileNotFoundError:
+            old_key = None
+        
+        with open(file_path, 'ab') as f:
+            f.write(b''.join(json_dumps(record) + b'\n' for record in records))
+        
+        new_key = _file_key(file_path)
+        self._index_cache.pop(file_path, None)
+        self._writes += 1
+        
+        cached = self._cache.get(file_path)
+        if cached is not None and cached[0] == old_key:
+            cached[1].extend(records)
+            self._cache[file_path] = (new_key, cached[1])
+        else:
+            self._cache.pop(file_path, None)
+        
+        if file_path == self.orders_file:
+            if self._next_order_id is not None and self._next_order_id[0] == old_key:
+                next_id = max([self._next_order_id[1]]
+                              + [record['order_id'] + 1 for record in records])
+                self._next_order_id = (new_key, next_id)
+            else:
+                self._next_order_id = None
+    
+    def get_data_version(self) -> tuple:
+        """Версия данных: счётчик записей и ключи _file_key файлов базы.
+
+        Счётчик меняется при каждой записи через этот экземпляр, даже
+        если время модификации и размер файла остались прежними, а ключи
+        файлов — при изменении файлов извне. Поэтому версия подходит
+        в качестве ключа для кэширования производных результатов.
+        """
+        version = [self._writes]
+        for file_path in (self.customers_file, self.products_file, self.orders_file):
+            try:
+                version.append(_file_key(file_path))
+            except FileNotFoundError:
+                version.append(None)
+        return tuple(version)
+    
+    def _get_index(self, file_path: Path, key: str) -> Dict[int, Dict]:
+        """Индекс записей файла по полю ``key``.
+
+        Индекс строится один раз для каждого загруженного списка и
+        перестраивается вместе с кэшем ``_load_data``.
+        """
+        data = self._load_data(file_path)
+        cached = self._index_cache.get(file_path)
+        if cached is not None and cached[0] is data:
+            return cached[1]
+        
+        index = {row[key]: row for row in data}
+        self._index_cache[file_path] = (data, index)
+        return index
+    
+    def _check_new_ids(self, ids: Iterable[int], file_path: Path, key: str, entity: str):
+        """Проверка, что ID не заняты в файле и не повторяются между собой.
+
+        Raises
+        ------
+        ValueError
+            Если запись с таким ID уже существует или ID повторяется.
+        """
+        existing_ids = self._get_index(file_path, key)
+        new_ids = set()
+        for new_id in ids:
+            if new_id in existing_ids or new_id in new_ids:
+                raise ValueError(f"{entity} с ID {new_id} уже существует")
+            new_ids.add(new_id)
+    
     # CRUD операции для клиентов
     def add_customer(self, customer: Customer):
         """Добавление клиента."""
-        customers = self._load_data(self.customers_file)
-        
-        # Проверка на существующий ID
-        if any(c['customer_id'] == customer.customer_id for c in customers):
-            raise ValueError(f"Клиент с ID {customer.customer_id} уже существует")
-        
-        customers.append(customer.to_dict())
-        self._save_data(customers, self.customers_file)
+        self.add_customers_bulk([customer])
+    
+    def add_customers_bulk(self, customers: List[Customer]):
+        """Добавление нескольких клиентов одной записью в файл.
+
+        Все ID проверяются заранее, поэтому при ошибке не сохраняется
+        ни один клиент.
+
+        Raises
+        ------
+        ValueError
+            Если клиент с таким ID уже существует или повторяется в пакете.
+        """
+        self._check_new_ids((c.customer_id for c in customers),
+                            self.customers_file, 'customer_id', "Клиент")
+        self._append_data([c.to_dict() for c in customers], self.customers_file)
     
     def get_customer(self, customer_id: int) -> Optional[Customer]:
         """Получение клиента по ID."""
-        customers = self._load_data(self.customers_file)
+        customer_data = self._get_index(self.customers_file, 'customer_id').get(customer_id)
+        if customer_data is None:
+            return None
         
-        for customer_data in customers:
-            if customer_data['customer_id'] == customer_id:
-                return Customer(
-                    customer_data['customer_id'],
-                    customer_data['name'],
-                    customer_data['email'],
-                    customer_data['phone'],
-                    customer_data['address']
-                )
-        return None
+        return Customer(
+            customer_data['customer_id'],
+            customer_data['name'],
+            customer_data['email'],
+            customer_data['phone'],
+            customer_data['address']
+        )
     
     def get_all_customers(self) -> List[Customer]:
         """Получение всех клиентов."""
@@ -109,40 +278,46 @@ class Database:
     # CRUD операции для товаров
     def add_product(self, product: Product):
         """Добавление товара."""
-        products = self._load_data(self.products_file)
-        
-        # Проверка на существующий ID
-        if any(p['product_id'] == product.product_id for p in products):
-            raise ValueError(f"Товар с ID {product.product_id} уже существует")
-        
-        products.append(product.to_dict())
-        self._save_data(products, self.products_file)
+        self.add_products_bulk([product])
+    
+    def add_products_bulk(self, products: List[Product]):
+        """Добавление нескольких товаров одной записью в файл.
+
+        Все ID проверяются заранее, поэтому при ошибке не сохраняется
+        ни один товар.
+
+        Raises
+        ------
+        ValueError
+            Если товар с таким ID уже существует или повторяется в пакете.
+        """
+        self._check_new_ids((p.product_id for p in products),
+                            self.products_file, 'product_id', "Товар")
+        self._append_data([p.to_dict() for p in products], self.products_file)
     
     def update_product_stock(self, product_id: int, quantity: int):
         """Обновление количества товара на складе."""
         products = self._load_data(self.products_file)
         
-        for product in products:
-            if product['product_id'] == product_id:
-                product['stock'] = max(0, product.get('stock', 0) + quantity)
-                break
+        product = self._get_index(self.products_file, 'product_id').get(product_id)
+        if product is not None:
+            product['stock'] = max(0, product.get('stock', 0) + quantity)
         
         self._save_data(products, self.products_file)
     
     def get_product(self, product_id: int) -> Optional[Product]:
         """Получение товара по ID."""
-        products = self._load_data(self.products_file)
+        product_data = self._get_index(self.products_file, 'product_id').get(product_id)
+        if product_data is None:
+            return None
         
-        for product_data in products:
-            if product_data['product_id'] == product_id:
-                return Product(
-                    product_data['product_id'],
-                    product_data['name'],
-                    product_data['price'],
-                    product_data['category'],
-                    product_data.get('stock', 0)
-                )
-        return None
+        return Product(
+            product_data['product_id'],
+            product_data['name'],
+            product_data['price'],
+            product_data['category'],
+            product_data.get('stock', 0)
+        )
     
     def get_all_products(self) -> List[Product]:
         """Получение всех товаров."""
@@ -160,105 +335,296 @@ class Database:
     # CRUD операции для заказов
     def add_order(self, order: Order):
         """Добавление заказа."""
-        orders = self._load_data(self.orders_file)
+        self.add_orders_bulk([order])
+    
+    def add_orders_bulk(self, orders: List[Order]):
+        """Добавление нескольких заказов одной операцией.
+
+        Все ID проверяются до каких-либо изменений, поэтому при ошибке
+        не сохраняется ни один заказ. Склад и файл заказов записываются
+        по одному разу на весь пакет.
+
+        Parameters
+        ----------
+        orders : List[Order]
+            Добавляемые заказы
+
+        Raises
+        ------
+        ValueError
+            Если заказ с таким ID уже существует или повторяется в пакете.
+        """
         products = self._load_data(self.products_file)
         
-        # Проверка на существующий ID
-        if any(o['order_id'] == order.order_id for o in orders):
-            raise ValueError(f"Заказ с ID {order.order_id} уже существует")
+        self._check_new_ids((o.order_id for o in orders),
+                            self.orders_file, 'order_id', "Заказ")
         
-        # Обновление количества товаров на складе
-        for item in order.items:
-            for product in products:
-                if product['product_id'] == item.product.product_id:
-                    product['stock'] = max(0, product.get('stock', 0) - item.quantity)
-                    break
+        # Обновление количества товаров на складе: позиции с одним товаром
+        # суммируются, и каждый товар обновляется один раз
+        quantities = Counter()
+        for order in orders:
+            for item in order.items:
+                quantities[item.product.product_id] += item.quantity
+        
+        prod_by_id = self._get_index(self.products_file, 'product_id')
+        for product_id, quantity in quantities.items():
+            product = prod_by_id.get(product_id)
+            if product is not None:
+                product['stock'] = max(0, product.get('stock', 0) - quantity)
         
         self._save_data(products, self.products_file)
         
-        # Сохранение заказа
-        orders.append(order.to_dict())
-        self._save_data(orders, self.orders_file)
+        # Сохранение заказов
+        self._append_data([order.to_dict() for order in orders], self.orders_file)
     
-    def get_order(self, order_id: int) -> Optional[Order]:
-        """Получение заказа по ID."""
-        orders = self._load_data(self.orders_file)
-        customers = self._load_data(self.customers_file)
-        products = self._load_data(self.products_file)
+    def _build_order(self, order_data: Dict,
+                     cust_by_id: Dict[int, Dict], prod_by_id: Dict[int, Dict],
+                     cust_objs: Dict[int, Customer],
+                     prod_objs: Dict[int, Product]) -> Optional[Order]:
+        """Сборка объекта заказа из словаря.
+
+        Parameters
+        ----------
+        order_data : dict
+            Данные заказа из файла
+        cust_by_id, prod_by_id : dict
+            Индексы сырых данных клиентов и товаров по ID
+        cust_objs, prod_objs : dict
+            Уже созданные объекты клиентов и товаров по ID; дополняются
+            по мере сборки, чтобы каждый объект создавался один раз
+        """
+        customer_id = order_data['customer_id']
+        customer = cust_objs.get(customer_id)
+        if customer is None:
+            customer_data = cust_by_id.get(customer_id)
+            if not customer_data:
+                return None
+            
+            customer = Customer(
+                customer_data['customer_id'],
+                customer_data['name'],
+                customer_data['email'],
+                customer_data['phone'],
+                customer_data['address']
+            )
+            cust_objs[customer_id] = customer
         
-        for order_data in orders:
-            if order_data['order_id'] == order_id:
-                # Находим клиента
-                customer_data = next(
-                    (c for c in customers if c['customer_id'] == order_data['customer_id']),
-                    None
-                )
-                if not customer_data:
-                    return None
-                
-                customer = Customer(
-                    customer_data['customer_id'],
-                    customer_data['name'],
-                    customer_data['email'],
-                    customer_data['phone'],
-                    customer_data['address']
-                )
+        # Создаем заказ
+        order = Order(
+            order_data['order_id'],
+            customer,
+            datetime.fromisoformat(order_data['date'])
+        )
+        
+        # Добавляем товары в заказ
+        for item_data in order_data['items']:
+            product_id = item_data['product_id']
+            product = prod_objs.get(product_id)
+            if product is None:
+                product_data = prod_by_id.get(product_id)
+                if not product_data:
+                    continue
                 
-                # Создаем заказ
-                order = Order(
-                    order_data['order_id'],
-                    customer,
-                    datetime.fromisoformat(order_data['date'])
+                product = Product(
+                    product_data['product_id'],
+                    product_data['name'],
+                    product_data['price'],
+                    product_data['category'],
+                    product_data.get('stock', 0)
                 )
-                
-                # Добавляем товары в заказ
-                for item_data in order_data['items']:
-                    product_data = next(
-                        (p for p in products if p['product_id'] == item_data['product_id']),
-                        None
-                    )
-                    if product_data:
-                        product = Product(
-                            product_data['product_id'],
-                            product_data['name'],
-                            product_data['price'],
-                            product_data['category'],
-                            product_data.get('stock', 0)
-                        )
-                        order.add_item(OrderItem(product, item_data['quantity']))
-                
-                return order
-        return None
+                prod_objs[product_id] = product
+            order.add_item(OrderItem(product, item_data['quantity']))
+        
+        return order
+    
+    def get_next_order_id(self) -> int:
+        """ID для нового заказа: на единицу больше максимального в базе.
+
+        Значение кэшируется до изменения файла заказов: дозапись заказов
+        продвигает его без обхода файла, а полная перезапись файла
+        (_save_data, в том числе при импорте) сбрасывает.
+        """
+        try:
+            key = _file_key(self.orders_file)
+        except FileNotFoundError:
+            key = None
+        if self._next_order_id is None or self._next_order_id[0] != key:
+            orders = self._load_data(self.orders_file)
+            next_id = max((o['order_id'] for o in orders), default=0) + 1
+            self._next_order_id = (key, next_id)
+        return self._next_order_id[1]
+    
+    def get_order(self, order_id: int) -> Optional[Order]:
+        """Получение заказа по ID."""
+        order_data = self._get_index(self.orders_file, 'order_id').get(order_id)
+        if order_data is None:
+            return None
+        
+        cust_by_id = self._get_index(self.customers_file, 'customer_id')
+        prod_by_id = self._get_index(self.products_file, 'product_id')
+        return self._build_order(order_data, cust_by_id, prod_by_id, {}, {})
     
     def get_all_orders(self) -> List[Order]:
-        """Получение всех заказов."""
-        orders = []
-        order_ids = [o['order_id'] for o in self._load_data(self.orders_file)]
+        """Получение всех заказов.
+
+        Каждый файл читается один раз, клиенты и товары ищутся по
+        словарям, а их объекты переиспользуются между заказами.
+        """
+        cust_by_id = self._get_index(self.customers_file, 'customer_id')
+        prod_by_id = self._get_index(self.products_file, 'product_id')
+        cust_objs: Dict[int, Customer] = {}
+        prod_objs: Dict[int, Product] = {}
         
-        for order_id in order_ids:
-            order = self.get_order(order_id)
+        orders = []
+        for order_data in self._load_data(self.orders_file):
+            order = self._build_order(order_data, cust_by_id, prod_by_id,
+                                      cust_objs, prod_objs)
             if order:
                 orders.append(order)
         
         return orders
     
+    def iter_orders(self) -> Iterator[Order]:
+        """Последовательный обход всех заказов.
+
+        Если файл заказов уже есть в кэше, обходится кэш; иначе файл
+        читается построчно, и в памяти одновременно находится только
+        текущий заказ — список всех заказов не строится.
+        """
+        cust_by_id = self._get_index(self.customers_file, 'customer_id')
+        prod_by_id = self._get_index(self.products_file, 'product_id')
+        cust_objs: Dict[int, Customer] = {}
+        prod_objs: Dict[int, Product] = {}
+        
+        for order_data in self._iter_records(self.orders_file):
+            order = self._build_order(order_data, cust_by_id, prod_by_id,
+                                      cust_objs, prod_objs)
+            if order:
+                yield order
+    
+    def _iter_records(self, file_path: Path) -> Iterator[Dict]:
+        """Построчное чтение записей JSONL-файла в обход кэша, если он устарел."""
+        cached = self._cache.get(file_path)
+        try:
+            if cached is not None and cached[0] == _file_key(file_path):
+                yield from cached[1]
+                return
+            
+            with open(file_path, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        yield json_loads(line)
+        except FileNotFoundError:
+            return
+    
+    # Статистика
+    def get_stats(self) -> Dict[str, Any]:
+        """Сводная статистика базы.
+
+        Считается по сырым данным без сборки объектов и кэшируется до
+        изменения версии данных, так что повторные вызовы без записи
+        в базу не обходят заказы.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Словарь с ключами 'customers', 'products', 'orders' (количество
+            записей) и 'revenue' (общая сумма заказов)
+        """
+        version = self.get_data_version()
+        if self._stats_cache is not None and self._stats_cache[0] == version:
+            return self._stats_cache[1]
+        
+        cust_by_id = self._get_index(self.customers_file, 'customer_id')
+        prod_by_id = self._get_index(self.products_file, 'product_id')
+        
+        # Как и в get_all_orders, учитываются только заказы известных
+        # клиентов и позиции известных товаров по текущей цене
+        order_count = 0
+        revenue = 0.0
+        for order_data in self._load_data(self.orders_file):
+            if order_data['customer_id'] not in cust_by_id:
+                continue
+            order_count += 1
+            total = 0.0
+            for item_data in order_data['items']:
+                product_data = prod_by_id.get(item_data['product_id'])
+                if product_data:
+                    total += product_data['price'] * item_data['quantity']
+            revenue += total
+        
+        stats = {
+            'customers': len(self._load_data(self.customers_file)),
+            'products': len(self._load_data(self.products_file)),
+            'orders': order_count,
+            'revenue': revenue
+        }
+        self._stats_cache = (version, stats)
+        return stats
+    
     # Экспорт и импорт данных
     def export_to_json(self, file_path: str):
-        """Экспорт всех данных в JSON файл."""
-        data = {
-            'customers': self._load_data(self.customers_file),
-            'products': self._load_data(self.products_file),
-            'orders': self._load_data(self.orders_file)
-        }
+        """Экспорт всех данных в JSON файл.
+
+        Строки JSONL-файлов уже являются готовыми JSON-записями, поэтому
+        они склеиваются в общий документ без разбора и повторной
+        сериализации, по одной записи на строку.
+        """
+        self.write_json_export(file_path, self.read_raw_records())
+    
+    def read_raw_records(self) -> Dict[str, List[bytes]]:
+        """Строки JSONL-файлов базы без разбора, по разделам экспорта.
+
+        Returns
+        -------
+        Dict[str, List[bytes]]
+            Словарь с ключами 'customers', 'products' и 'orders'
+        """
+        sections = (
+            ('customers', self.customers_file),
+            ('products', self.products_file),
+            ('orders', self.orders_file)
+        )
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        records = {}
+        for name, source in sections:
+            try:
+                records[name] = [line for line in source.read_bytes().splitlines()
+                                 if line.strip()]
+            except FileNotFoundError:
+                records[name] = []
+        return records
+    
+    @staticmethod
+    def write_json_export(file_path: str, records: Dict[str, List[bytes]]):
+        """Запись строк, полученных от read_raw_records, в JSON файл экспорта.
+
+        Не обращается к файлам базы, поэтому может выполняться в другом
+        потоке, пока база изменяется.
+        """
+        with open(file_path, 'wb') as f:
+            f.write(b'{')
+            for i, (name, lines) in enumerate(records.items()):
+                f.write(b',' if i else b'')
+                f.write(b'\n    "%s": [' % name.encode())
+                if lines:
+                    f.write(b'\n        ' + b',\n        '.join(lines) + b'\n    ')
+                f.write(b']')
+            f.write(b'\n}\n')
     
     def import_from_json(self, file_path: str):
         """Импорт данных из JSON файла."""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
+        self.import_data(json_loads(Path(file_path).read_bytes()))
+    
+    def import_data(self, data: Dict[str, List[Dict]]):
+        """Замена всех данных уже разобранным содержимым экспорта.
+
+        Parameters
+        ----------
+        data : dict
+            Словарь с ключами 'customers', 'products' и 'orders', как в
+            файле export_to_json
+        """
         self._save_data(data.get('customers', []), self.customers_file)
         self._save_data(data.get('products', []), self.products_file)
         self._save_data(data.get('orders', []), self.orders_file)
@@ -269,10 +635,10 @@ class Database:
         export_dir.mkdir(parents=True, exist_ok=True)
         
         # Экспорт клиентов
-        self._save_data(self._load_data(self.customers_file), export_dir / 'customers.csv')
+        self._write_file(self._load_data(self.customers_file), export_dir / 'customers.csv')
         
         # Экспорт товаров
-        self._save_data(self._load_data(self.products_file), export_dir / 'products.csv')
+        self._write_file(self._load_data(self.products_file), export_dir / 'products.csv')
         
         # Экспорт заказов
-        self._save_data(self._load_data(self.orders_file), export_dir / 'orders.csv')
\ No newline at end of file
+        self._write_file(self._load_data(self.orders_file), export_dir / 'orders.csv')
\ No newline at end of file
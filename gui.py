@@ -11,16 +11,204 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from datetime import datetime
-from typing import Optional, List, Dict, Any
-import json
+from typing import Optional, List, Dict, Any, Callable, Iterable, Sequence, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from bisect import bisect_right
 import csv
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 
 from models import Customer, Product, Order, OrderItem
-from db import Database
+from db import Database, json_loads, json_dumps
 from analysis import DataAnalyzer
 
+# Формат даты заказа в таблице и форме заказа
+DATE_FORMAT = "%Y-%m-%d %H:%M"
+
+def set_tree_rows(tree: ttk.Treeview, rows: Sequence[Sequence],
+                  tags: Optional[Sequence[Tuple[str, ...]]] = None):
+    """Замена строк таблицы с переиспользованием уже созданных элементов.
+
+    Существующие элементы получают новые значения через ``item``, а
+    создаются или удаляются только недостающие или лишние, что экономит
+    обращения к Tcl при частых обновлениях. Выделение снимается.
+    """
+    items = tree.get_children()
+    if tree.selection():
+        tree.selection_remove(*tree.selection())
+    
+    for i, values in enumerate(rows):
+        row_tags = tags[i] if tags is not None else ()
+        if i < len(items):
+            tree.item(items[i], values=values, tags=row_tags)
+        else:
+            tree.insert("", tk.END, values=values, tags=row_tags)
+    
+    if len(items) > len(rows):
+        tree.delete(*items[len(rows):])
+
+class SearchIndex:
+    """Индекс подстрочного поиска по строкам таблицы.
+
+    Строки для поиска приводятся к ``casefold`` и UTF-8 один раз при
+    построении и склеиваются через перевод строки в один буфер байтов;
+    запрос ищется ``bytes.find`` по всему буферу за один проход вместо
+    проверки каждой строки отдельно. Номер строки совпадения находится
+    по смещениям начала строк.
+    """
+    
+    def __init__(self, haystacks: Iterable[str] = ()):
+        encoded = [h.casefold().encode('utf-8') for h in haystacks]
+        self._starts: List[int] = []
+        pos = 0
+        for haystack in encoded:
+            self._starts.append(pos)
+            pos += len(haystack) + 1
+        self._text = b"\n".join(encoded)
+    
+    def find(self, term: str) -> List[int]:
+        """Номера строк, содержащих подстроку ``term`` без учёта регистра."""
+        rows = []
+        starts = self._starts
+        term = term.casefold().encode('utf-8')
+        pos = self._text.find(term) if starts else -1
+        while pos != -1:
+            row = bisect_right(starts, pos) - 1
+            rows.append(row)
+            if row + 1 == len(starts):
+                break
+            pos = self._text.find(term, starts[row + 1])
+        return rows
+
+class VirtualTreeview:
+    """Виртуальная прокрутка для ttk.Treeview.
+
+    Все строки хранятся в списке, а в виджет вставляются только те, что
+    помещаются в видимую область. Прокрутка (скроллбар, колесо мыши,
+    стрелки) перерисовывает это окно, поэтому стоимость обновления не
+    зависит от количества строк. Элементы виджета переиспользуются
+    (см. ``set_tree_rows``); после прокрутки выделение снимается, как
+    при полной перерисовке таблицы.
+    """
+    
+    def __init__(self, tree: ttk.Treeview, scrollbar: ttk.Scrollbar):
+        """Parameters.
+
+        ----------
+        tree : ttk.Treeview
+            Таблица, в которой отображаются строки
+        scrollbar : ttk.Scrollbar
+            Вертикальный скроллбар таблицы
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self._rows: List[Sequence] = []
+        self._tags: List[Tuple[str, ...]] = []
+        self._first = 0
+        self._window: Optional[Tuple[int, int]] = None
+        
+        scrollbar.configure(command=self._on_scrollbar)
+        tree.configure(yscrollcommand='')
+        tree.bind('<Configure>', lambda event: self._render(), add='+')
+        tree.bind('<MouseWheel>', self._on_mousewheel, add='+')
+        tree.bind('<Button-4>', lambda event: self._scroll_by(-3), add='+')
+        tree.bind('<Button-5>', lambda event: self._scroll_by(3), add='+')
+        tree.bind('<Up>', lambda event: self._on_arrow(-1), add='+')
+        tree.bind('<Down>', lambda event: self._on_arrow(1), add='+')
+    
+    def set_rows(self, rows: Sequence[Sequence],
+                 tags: Optional[Sequence[Tuple[str, ...]]] = None):
+        """Замена всех строк таблицы с прокруткой в начало."""
+        self._rows = list(rows)
+        self._tags = list(tags) if tags is not None else [()] * len(self._rows)
+        self._first = 0
+        self._window = None
+        self._render()
+    
+    def _visible_count(self) -> int:
+        """Количество строк, целиком помещающихся в область строк таблицы.
+
+        Пока виджет не отображён, берётся его высота в строках (``height``).
+        Затем высота строки и отступ области строк от верха виджета
+        (заголовок и рамка) измеряются по ``bbox`` первой строки; рамка
+        снизу считается равной рамке слева.
+        """
+        height = self.tree.winfo_height()
+        if not self.tree.winfo_ismapped() or height <= 1:
+            return max(int(self.tree.cget('height')), 1)
+        
+        children = self.tree.get_children()
+        bbox = self.tree.bbox(children[0]) if children else ''
+        if bbox:
+            border, top, _, row_height = bbox
+        else:
+            # Строк ещё нет: высота строки из стиля, заголовок — примерно строка
+            style = self.tree.cget('style') or 'Treeview'
+            row_height = int(ttk.Style().lookup(style, 'rowheight') or 20)
+            border, top = 0, row_height
+        return max((height - top - border) // max(row_height, 1), 1)
+    
+    def _render(self, remeasure: bool = True):
+        """Вставка в виджет строк текущего окна прокрутки.
+
+        Если после вставки измеренное число видимых строк отличается от
+        оценки, по которой вставлялись строки, окно перерисовывается ещё раз.
+        """
+        count = self._visible_count()
+        total = len(self._rows)
+        self._first = max(0, min(self._first, total - count))
+        window = (self._first, count)
+        
+        if window != self._window:
+            self._window = window
+            end = min(self._first + count, total)
+            set_tree_rows(self.tree, self._rows[self._first:end], self._tags[self._first:end])
+            if remeasure and self._visible_count() != count:
+                self._render(remeasure=False)
+                return
+        
+        if total > count:
+            self.scrollbar.set(self._first / total, (self._first + count) / total)
+        else:
+            self.scrollbar.set(0, 1)
+    
+    def _scroll_by(self, rows: int) -> str:
+        """Прокрутка на заданное число строк."""
+        self._first += rows
+        self._render()
+        return 'break'
+    
+    def _on_scrollbar(self, action: str, value: str, unit: Optional[str] = None):
+        """Обработка команд скроллбара (moveto/scroll)."""
+        if action == 'moveto':
+            self._first = round(float(value) * len(self._rows))
+            self._render()
+        elif action == 'scroll':
+            step = self._visible_count() if unit == 'pages' else 1
+            self._scroll_by(int(value) * step)
+    
+    def _on_mousewheel(self, event) -> str:
+        """Прокрутка колесом мыши."""
+        return self._scroll_by(-3 if event.delta > 0 else 3)
+    
+    def _on_arrow(self, direction: int) -> Optional[str]:
+        """Переход стрелками за границу видимого окна с прокруткой."""
+        children = self.tree.get_children()
+        if not children or self.tree.focus() != children[0 if direction < 0 else -1]:
+            return None
+        
+        # Индекс строки, на которую переходит курсор, в полном списке
+        index = self._first - 1 if direction < 0 else self._first + len(children)
+        if not 0 <= index < len(self._rows):
+            return 'break'
+        
+        self._first += direction
+        self._render()
+        item = self.tree.get_children()[index - self._first]
+        self.tree.focus(item)
+        self.tree.selection_set(item)
+        return 'break'
+
 class OrderManagementApp:
     """Главное приложение для управления заказами."""
     
@@ -40,7 +228,33 @@ class OrderManagementApp:
         
         self.current_customer: Optional[Customer] = None
         self.current_order: Optional[Order] = None
-        self.order_items: List[OrderItem] = []
+        
+        # Отложенные задачи поиска (id из root.after)
+        self._customer_search_after_id: Optional[str] = None
+        self._product_search_after_id: Optional[str] = None
+        
+        # Снимки списков клиентов, товаров и заказов: (версия данных БД, список)
+        self._customers_cache: Optional[Tuple[Tuple[int, ...], List[Customer]]] = None
+        self._products_cache: Optional[Tuple[Tuple[int, ...], List[Product]]] = None
+        self._orders_cache: Optional[Tuple[Tuple[int, ...], List[Order]]] = None
+        
+        # Отформатированные строки таблиц, параллельные снимкам
+        self._customer_rows: List[tuple] = []
+        self._product_rows: List[tuple] = []
+        self._order_rows: List[tuple] = []
+        
+        # Строки товаров для комбобокса заказа, параллельные снимку товаров
+        self._product_display_cache: List[str] = []
+        
+        # Клиенты из снимка по ID
+        self._customers_by_id: Dict[int, Customer] = {}
+        
+        # Индексы поиска, параллельные снимкам
+        self._customers_search_idx = SearchIndex()
+        self._products_search_idx = SearchIndex()
+        
+        # Фоновый поток для чтения и записи файлов импорта/экспорта
+        self._executor = ThreadPoolExecutor(max_workers=1)
         
         self._setup_ui()
     
@@ -74,6 +288,33 @@ class OrderManagementApp:
         self.admin_tab = ttk.Frame(self.notebook)
         self.notebook.add(self.admin_tab, text="Администрирование")
         self._setup_admin_tab()
+        
+        # Данные вкладки загружаются при первом её открытии
+        self._tab_populators = {
+            str(self.customer_tab): self._update_customer_list,
+            str(self.product_tab): self._update_product_list,
+            str(self.order_tab): self._populate_order_tab,
+            str(self.admin_tab): self._update_stats
+        }
+        self._tab_initialized: Dict[str, bool] = {}
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
+        self._on_tab_changed()
+    
+    def _on_tab_changed(self, event=None):
+        """Заполнение выбранной вкладки данными при первом открытии."""
+        tab = self.notebook.select()
+        if self._tab_initialized.get(tab):
+            return
+        self._tab_initialized[tab] = True
+        
+        populate = self._tab_populators.get(tab)
+        if populate:
+            populate()
+    
+    def _populate_order_tab(self):
+        """Заполнение вкладки заказов данными."""
+        self._update_product_combobox()
+        self._update_order_list()
     
     def _setup_customer_tab(self):
         """Настройка вкладки клиентов."""
@@ -147,8 +388,8 @@ class OrderManagementApp:
                                     anchor=tk.W, minwidth=50, stretch=True)
     
         # Добавляем скроллбар
-        scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.customer_tree.yview)
-        self.customer_tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL)
+        self.customer_vtree = VirtualTreeview(self.customer_tree, scrollbar)
         
         # Размещаем Treeview и скроллбар
         self.customer_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -160,9 +401,6 @@ class OrderManagementApp:
         
         self.customer_tree.bind('<<TreeviewSelect>>', self._on_customer_select)
 
-        # Обновление данных
-        self._update_customer_list()
-
     def _setup_product_tab(self):
         """Настройка вкладки товаров."""
         # Панель управления
@@ -186,18 +424,22 @@ class OrderManagementApp:
         self.product_search_entry.bind('<KeyRelease>', self._search_products)
         
         # Таблица товаров
+        tree_frame = ttk.Frame(self.product_tab)
+        tree_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
         columns = ("ID", "Название", "Цена", "Категория", "На складе")
         self.product_tree = ttk.Treeview(
-            self.product_tab, columns=columns, show="headings", selectmode="browse")
+            tree_frame, columns=columns, show="headings", selectmode="browse")
         
         for col in columns:
             self.product_tree.heading(col, text=col)
             self.product_tree.column(col, width=100, anchor=tk.W)
         
-        self.product_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL)
+        self.product_vtree = VirtualTreeview(self.product_tree, scrollbar)
         
-        # Обновление данных
-        self._update_product_list()
+        self.product_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
     
     def _setup_order_tab(self):
         """Настройка вкладки заказов."""
@@ -225,7 +467,7 @@ class OrderManagementApp:
         self.order_customer_label.grid(row=0, column=1, sticky=tk.W, padx=5, pady=2)
         
         ttk.Label(order_info_frame, text="Дата:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=2)
-        self.order_date_label = ttk.Label(order_info_frame, text=datetime.now().strftime("%Y-%m-%d %H:%M"))
+        self.order_date_label = ttk.Label(order_info_frame)
         self.order_date_label.grid(row=1, column=1, sticky=tk.W, padx=5, pady=2)
         
         ttk.Label(order_info_frame, text="Сумма:").grid(row=2, column=0, sticky=tk.W, padx=5, pady=2)
@@ -239,7 +481,6 @@ class OrderManagementApp:
         ttk.Label(add_product_frame, text="Товар:").pack(side=tk.LEFT)
         self.product_combobox = ttk.Combobox(add_product_frame, state="readonly", width=30)
         self.product_combobox.pack(side=tk.LEFT, padx=5)
-        self._update_product_combobox()
         
         ttk.Label(add_product_frame, text="Количество:").pack(side=tk.LEFT, padx=5)
         self.quantity_spinbox = ttk.Spinbox(add_product_frame, from_=1, to=100, width=5)
@@ -261,18 +502,23 @@ class OrderManagementApp:
         self.order_items_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
         # Таблица всех заказов
+        tree_frame = ttk.Frame(self.order_tab)
+        tree_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
         self.order_tree = ttk.Treeview(
-            self.order_tab, columns=("ID", "Клиент", "Дата", "Сумма"), show="headings", height=8)
+            tree_frame, columns=("ID", "Клиент", "Дата", "Сумма"), show="headings", height=8)
         
         for col in ("ID", "Клиент", "Дата", "Сумма"):
             self.order_tree.heading(col, text=col)
             self.order_tree.column(col, width=100, anchor=tk.W)
         
-        self.order_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL)
+        self.order_vtree = VirtualTreeview(self.order_tree, scrollbar)
+        
+        self.order_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.order_tree.bind('<<TreeviewSelect>>', self._on_order_select)
         
-        # Обновление данных
-        self._update_order_list()
         self._clear_order_form()
     
     def _setup_analysis_tab(self):
@@ -293,6 +539,7 @@ class OrderManagementApp:
         # Область для графиков
         self.analysis_frame = ttk.Frame(self.analysis_tab)
         self.analysis_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self._analysis_canvas: Optional[FigureCanvasTkAgg] = None
     
     def _setup_admin_tab(self):
         """Настройка вкладки администрирования."""
@@ -326,56 +573,112 @@ class OrderManagementApp:
         ttk.Label(stats_frame, text="Общая выручка:").pack(side=tk.LEFT, padx=5)
         self.total_revenue_label = ttk.Label(stats_frame, text="0.00")
         self.total_revenue_label.pack(side=tk.LEFT, padx=5)
+    
+    # Фоновые операции с файлами
+    @staticmethod
+    def _write_records(file_path: str, records: Iterable[Dict], fieldnames: Sequence[str]):
+        """Потоковая запись словарей в JSON или CSV файл по расширению.
+
+        Записи пишутся по мере получения, без сборки общего списка;
+        в JSON каждая запись занимает одну строку массива.
+        """
+        if file_path.endswith('.json'):
+            with open(file_path, 'wb') as f:
+                f.write(b'[')
+                for i, record in enumerate(records):
+                    f.write(b',\n    ' if i else b'\n    ')
+                    f.write(json_dumps(record))
+                f.write(b'\n]\n')
+        
+        elif file_path.endswith('.csv'):
+            with open(file_path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                writer.writeheader()
+                writer.writerows(records)
+    
+    def _run_in_background(self, work: Callable[[], Any],
+                           on_done: Callable[[Any], None], error_prefix: str):
+        """Выполнение work() в фоновом потоке и передача результата в on_done.
+
+        Готовность результата проверяется таймером в главном потоке, так
+        что on_done и сообщения об ошибках работают с виджетами безопасно.
+        Исключения из work() и on_done() показываются пользователю.
+        """
+        future = self._executor.submit(work)
         
-        # Обновление статистики
-        self._update_stats()
+        def poll():
+            if not future.done():
+                self.root.after(50, poll)
+                return
+            try:
+                on_done(future.result())
+            except Exception as e:
+                messagebox.showerror("Ошибка", f"{error_prefix}: {e}")
+        
+        self.root.after(50, poll)
     
     # Методы для работы с клиентами
-    def _update_customer_list(self, customers: Optional[List[Customer]] = None):
-        """Обновление списка клиентов."""
-        if customers is None:
+    def _get_customers(self) -> List[Customer]:
+        """Список всех клиентов из кэша, обновляемого при изменении базы."""
+        version = self.db.get_data_version()
+        if self._customers_cache is None or self._customers_cache[0] != version:
             customers = self.db.get_all_customers()
+            self._customers_cache = (version, customers)
+            self._customers_by_id = {c.customer_id: c for c in customers}
+            self._customer_rows = [
+                (c.customer_id, c.name, c.email, c.phone, c.address)
+                for c in customers
+            ]
+            self._customers_search_idx = SearchIndex([
+                f"{c.customer_id}\x1f{c.name}\x1f{c.email}\x1f{c.phone}\x1f{c.address}"
+                for c in customers
+            ])
+        return self._customers_cache[1]
+    
+    def _update_customer_list(self, indices: Optional[List[int]] = None):
+        """Обновление списка клиентов.
+
+        ``indices`` — номера показываемых клиентов в снимке (по умолчанию все).
+        """
+        self._get_customers()
+        rows = self._customer_rows
+        if indices is not None:
+            rows = [rows[i] for i in indices]
         
-        self.customer_tree.delete(*self.customer_tree.get_children())
-        
-        for i, customer in enumerate(customers):
-            tag = 'even' if i % 2 == 0 else 'odd'
-            self.customer_tree.insert("", tk.END, values=(
-                customer.customer_id,
-                customer.name,
-                customer.email,
-                customer.phone,
-                customer.address
-            ), tags=(tag,))
+        tags = [('even',) if i % 2 == 0 else ('odd',) for i in range(len(rows))]
+        self.customer_vtree.set_rows(rows, tags)
     
     def _search_customers(self, event=None):
-        """Поиск клиентов."""
-        search_term = self.customer_search_entry.get().lower()
+        """Поиск клиентов.
+
+        Фильтрация откладывается до паузы в вводе, чтобы не обновлять
+        таблицу на каждое нажатие клавиши.
+        """
+        if self._customer_search_after_id is not None:
+            self.root.after_cancel(self._customer_search_after_id)
+        self._customer_search_after_id = self.root.after(250, self._do_customer_search)
+    
+    def _do_customer_search(self):
+        """Фильтрация списка клиентов по строке поиска."""
+        self._customer_search_after_id = None
+        search_term = self.customer_search_entry.get()
         
         if not search_term:
             self._update_customer_list()
             return
         
-        customers = self.db.get_all_customers()
-        filtered = [
-            c for c in customers 
-            if (search_term in str(c.customer_id).lower() or 
-                search_term in c.name.lower() or 
-                search_term in c.email.lower() or 
-                search_term in c.phone.lower() or 
-                search_term in c.address.lower())
-        ]
-        
-        self._update_customer_list(filtered)
+        self._get_customers()
+        self._update_customer_list(self._customers_search_idx.find(search_term))
     
     def _on_customer_select(self, event):
         """Обработка выбора клиента."""
-        selected = self.customer_tree.focus()
+        selected = self.customer_tree.selection()
         if not selected:
             return
         
-        customer_id = self.customer_tree.item(selected)['values'][0]
-        self.current_customer = self.db.get_customer(customer_id)
+        customer_id = self.customer_tree.item(selected[0])['values'][0]
+        self._get_customers()
+        self.current_customer = self._customers_by_id.get(customer_id)
     
     def _show_add_customer_dialog(self):
         """Показ диалога добавления клиента."""
@@ -445,7 +748,11 @@ class OrderManagementApp:
             messagebox.showerror("Ошибка", f"Неверные данные: {e}")
     
     def _import_customers(self):
-        """Импорт клиентов из файла."""
+        """Импорт клиентов из файла.
+
+        Файл читается и разбирается в фоновом потоке; запись в базу и
+        обновление таблицы выполняются в главном потоке.
+        """
         file_path = filedialog.askopenfilename(
             title="Импорт клиентов",
             filetypes=(("JSON files", "*.json"), ("CSV files", "*.csv")))
@@ -453,33 +760,52 @@ class OrderManagementApp:
         if not file_path:
             return
         
-        try:
-            if file_path.endswith('.json'):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                for customer_data in data:
-                    self.db.add_customer(Customer(**customer_data))
-            
-            elif file_path.endswith('.csv'):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        self.db.add_customer(Customer(
-                            int(row['customer_id']),
-                            row['name'],
-                            row['email'],
-                            row['phone'],
-                            row['address']
-                        ))
+        self._run_in_background(
+            lambda: self._read_customers_file(file_path),
+            self._finish_import_customers,
+            "Ошибка импорта"
+        )
+    
+    @staticmethod
+    def _read_customers_file(file_path: str) -> List[Customer]:
+        """Чтение клиентов из JSON/CSV файла (без обращения к виджетам)."""
+        if file_path.endswith('.json'):
+            with open(file_path, 'rb') as f:
+                data = json_loads(f.read())
             
-            self._update_customer_list()
-            messagebox.showinfo("Успех", "Клиенты успешно импортированы")
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Ошибка импорта: {e}")
+            return [Customer(**customer_data) for customer_data in data]
+        
+        if file_path.endswith('.csv'):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                reader = csv.reader(f)
+                header = next(reader, None)
+                if header is None:
+                    return []
+                
+                # Позиции колонок определяются по заголовку один раз
+                idx = {name: i for i, name in enumerate(header)}
+                id_i, name_i, email_i, phone_i, address_i = (
+                    idx['customer_id'], idx['name'], idx['email'], idx['phone'], idx['address'])
+                return [
+                    Customer(
+                        int(row[id_i]),
+                        row[name_i],
+                        row[email_i],
+                        row[phone_i],
+                        row[address_i]
+                    ) for row in reader if row
+                ]
+        
+        return []
+    
+    def _finish_import_customers(self, customers: List[Customer]):
+        """Сохранение импортированных клиентов и обновление таблицы."""
+        self.db.add_customers_bulk(customers)
+        self._update_customer_list()
+        messagebox.showinfo("Успех", "Клиенты успешно импортированы")
     
     def _export_customers(self):
-        """Экспорт клиентов в файл."""
+        """Экспорт клиентов в файл (запись файла — в фоновом потоке)."""
         file_path = filedialog.asksaveasfilename(
             title="Экспорт клиентов",
             defaultextension=".json",
@@ -488,63 +814,73 @@ class OrderManagementApp:
         if not file_path:
             return
         
-        try:
-            customers = self.db.get_all_customers()
-            data = [customer.to_dict() for customer in customers]
-            
-            if file_path.endswith('.json'):
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=4, ensure_ascii=False)
-            
-            elif file_path.endswith('.csv'):
-                with open(file_path, 'w', encoding='utf-8', newline='') as f:
-                    writer = csv.DictWriter(f, fieldnames=data[0].keys())
-                    writer.writeheader()
-                    writer.writerows(data)
-            
-            messagebox.showinfo("Успех", "Клиенты успешно экспортированы")
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Ошибка экспорта: {e}")
+        customers = self._get_customers()
+        self._run_in_background(
+            lambda: self._write_records(
+                file_path, (c.to_dict() for c in customers),
+                ('customer_id', 'name', 'email', 'phone', 'address')),
+            lambda _: messagebox.showinfo("Успех", "Клиенты успешно экспортированы"),
+            "Ошибка экспорта"
+        )
     
     # Методы для работы с товарами
-    def _update_product_list(self, products: Optional[List[Product]] = None):
-        """Обновление списка товаров."""
-        if products is None:
+    def _get_products(self) -> List[Product]:
+        """Список всех товаров из кэша, обновляемого при изменении базы."""
+        version = self.db.get_data_version()
+        if self._products_cache is None or self._products_cache[0] != version:
             products = self.db.get_all_products()
+            self._products_cache = (version, products)
+            self._product_rows = [
+                (p.product_id, p.name, f"{p.price:.2f}", p.category, p.stock)
+                for p in products
+            ]
+            self._product_display_cache = [
+                f"{p.product_id}: {p.name} ({p.price:.2f} руб.)" for p in products
+            ]
+            self._products_search_idx = SearchIndex([
+                f"{p.product_id}\x1f{p.name}\x1f{p.category}"
+                for p in products
+            ])
+        return self._products_cache[1]
+    
+    def _update_product_list(self, indices: Optional[List[int]] = None):
+        """Обновление списка товаров.
+
+        ``indices`` — номера показываемых товаров в снимке (по умолчанию все).
+        """
+        self._get_products()
+        rows = self._product_rows
+        if indices is not None:
+            rows = [rows[i] for i in indices]
         
-        self.product_tree.delete(*self.product_tree.get_children())
-        
-        for product in products:
-            self.product_tree.insert("", tk.END, values=(
-                product.product_id,
-                product.name,
-                f"{product.price:.2f}",
-                product.category,
-                product.stock
-            ))
+        self.product_vtree.set_rows(rows)
     
     def _search_products(self, event=None):
-        """Поиск товаров."""
-        search_term = self.product_search_entry.get().lower()
+        """Поиск товаров.
+
+        Фильтрация откладывается до паузы в вводе, чтобы не обновлять
+        таблицу на каждое нажатие клавиши.
+        """
+        if self._product_search_after_id is not None:
+            self.root.after_cancel(self._product_search_after_id)
+        self._product_search_after_id = self.root.after(250, self._do_product_search)
+    
+    def _do_product_search(self):
+        """Фильтрация списка товаров по строке поиска."""
+        self._product_search_after_id = None
+        search_term = self.product_search_entry.get()
         
         if not search_term:
             self._update_product_list()
             return
         
-        products = self.db.get_all_products()
-        filtered = [
-            p for p in products 
-            if (search_term in str(p.product_id).lower() or 
-                search_term in p.name.lower() or 
-                search_term in p.category.lower())
-        ]
-        
-        self._update_product_list(filtered)
+        self._get_products()
+        self._update_product_list(self._products_search_idx.find(search_term))
     
     def _update_product_combobox(self):
         """Обновление списка товаров в комбобоксе."""
-        products = self.db.get_all_products()
-        product_names = [f"{p.product_id}: {p.name} ({p.price:.2f} руб.)" for p in products]
+        self._get_products()
+        product_names = self._product_display_cache
         self.product_combobox['values'] = product_names
         if product_names:
             self.product_combobox.current(0)
@@ -617,7 +953,11 @@ class OrderManagementApp:
             messagebox.showerror("Ошибка", f"Неверные данные: {e}")
     
     def _import_products(self):
-        """Импорт товаров из файла."""
+        """Импорт товаров из файла.
+
+        Файл читается и разбирается в фоновом потоке; запись в базу и
+        обновление таблицы выполняются в главном потоке.
+        """
         file_path = filedialog.askopenfilename(
             title="Импорт товаров",
             filetypes=(("JSON files", "*.json"), ("CSV files", "*.csv")))
@@ -625,34 +965,54 @@ class OrderManagementApp:
         if not file_path:
             return
         
-        try:
-            if file_path.endswith('.json'):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                for product_data in data:
-                    self.db.add_product(Product(**product_data))
-            
-            elif file_path.endswith('.csv'):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        self.db.add_product(Product(
-                            int(row['product_id']),
-                            row['name'],
-                            float(row['price']),
-                            row['category'],
-                            int(row.get('stock', 0))
-                        ))
+        self._run_in_background(
+            lambda: self._read_products_file(file_path),
+            self._finish_import_products,
+            "Ошибка импорта"
+        )
+    
+    @staticmethod
+    def _read_products_file(file_path: str) -> List[Product]:
+        """Чтение товаров из JSON/CSV файла (без обращения к виджетам)."""
+        if file_path.endswith('.json'):
+            with open(file_path, 'rb') as f:
+                data = json_loads(f.read())
             
-            self._update_product_list()
-            self._update_product_combobox()
-            messagebox.showinfo("Успех", "Товары успешно импортированы")
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Ошибка импорта: {e}")
+            return [Product(**product_data) for product_data in data]
+        
+        if file_path.endswith('.csv'):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                reader = csv.reader(f)
+                header = next(reader, None)
+                if header is None:
+                    return []
+                
+                # Позиции колонок определяются по заголовку один раз
+                idx = {name: i for i, name in enumerate(header)}
+                id_i, name_i, price_i, category_i = (
+                    idx['product_id'], idx['name'], idx['price'], idx['category'])
+                stock_i = idx.get('stock')
+                return [
+                    Product(
+                        int(row[id_i]),
+                        row[name_i],
+                        float(row[price_i]),
+                        row[category_i],
+                        int(row[stock_i]) if stock_i is not None else 0
+                    ) for row in reader if row
+                ]
+        
+        return []
+    
+    def _finish_import_products(self, products: List[Product]):
+        """Сохранение импортированных товаров и обновление таблиц."""
+        self.db.add_products_bulk(products)
+        self._update_product_list()
+        self._update_product_combobox()
+        messagebox.showinfo("Успех", "Товары успешно импортированы")
     
     def _export_products(self):
-        """Экспорт товаров в файл."""
+        """Экспорт товаров в файл (запись файла — в фоновом потоке)."""
         file_path = filedialog.asksaveasfilename(
             title="Экспорт товаров",
             defaultextension=".json",
@@ -661,46 +1021,41 @@ class OrderManagementApp:
         if not file_path:
             return
         
-        try:
-            products = self.db.get_all_products()
-            data = [product.to_dict() for product in products]
-            
-            if file_path.endswith('.json'):
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=4, ensure_ascii=False)
-            
-            elif file_path.endswith('.csv'):
-                with open(file_path, 'w', encoding='utf-8', newline='') as f:
-                    writer = csv.DictWriter(f, fieldnames=data[0].keys())
-                    writer.writeheader()
-                    writer.writerows(data)
-            
-            messagebox.showinfo("Успех", "Товары успешно экспортированы")
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Ошибка экспорта: {e}")
+        products = self._get_products()
+        self._run_in_background(
+            lambda: self._write_records(
+                file_path, (p.to_dict() for p in products),
+                ('product_id', 'name', 'price', 'category', 'stock')),
+            lambda _: messagebox.showinfo("Успех", "Товары успешно экспортированы"),
+            "Ошибка экспорта"
+        )
     
     # Методы для работы с заказами
+    def _get_orders(self) -> List[Order]:
+        """Список всех заказов из кэша, обновляемого при изменении базы."""
+        version = self.db.get_data_version()
+        if self._orders_cache is None or self._orders_cache[0] != version:
+            orders = self.db.get_all_orders()
+            self._orders_cache = (version, orders)
+            self._order_rows = [
+                (o.order_id, o.customer.name, o.date.strftime(DATE_FORMAT),
+                 f"{o.total_amount:.2f}")
+                for o in orders
+            ]
+        return self._orders_cache[1]
+    
     def _update_order_list(self):
         """Обновление списка заказов."""
-        orders = self.db.get_all_orders()
-        
-        self.order_tree.delete(*self.order_tree.get_children())
-        
-        for order in orders:
-            self.order_tree.insert("", tk.END, values=(
-                order.order_id,
-                order.customer.name,
-                order.date.strftime("%Y-%m-%d %H:%M"),
-                f"{order.total_amount:.2f}"
-            ))
+        self._get_orders()
+        self.order_vtree.set_rows(self._order_rows)
     
     def _on_order_select(self, event):
         """Обработка выбора заказа."""
-        selected = self.order_tree.focus()
+        selected = self.order_tree.selection()
         if not selected:
             return
         
-        order_id = self.order_tree.item(selected)['values'][0]
+        order_id = self.order_tree.item(selected[0])['values'][0]
         self._load_order(order_id)
     
     def _load_order(self, order_id: int):
@@ -714,27 +1069,25 @@ class OrderManagementApp:
         
         # Обновление информации о заказе
         self.order_customer_label.config(text=f"{order.customer.name} (ID: {order.customer.customer_id})")
-        self.order_date_label.config(text=order.date.strftime("%Y-%m-%d %H:%M"))
+        self.order_date_label.config(text=order.date.strftime(DATE_FORMAT))
         self.order_total_label.config(text=f"{order.total_amount:.2f}")
         
         # Обновление списка товаров
-        self.order_items_tree.delete(*self.order_items_tree.get_children())
-        for item in order.items:
-            self.order_items_tree.insert("", tk.END, values=(
-                f"{item.product.name} (ID: {item.product.product_id})",
-                f"{item.price:.2f}",
-                item.quantity,
-                f"{item.total_price:.2f}"
-            ))
+        set_tree_rows(self.order_items_tree, [
+            (f"{item.product.name} (ID: {item.product.product_id})",
+             f"{item.price:.2f}",
+             item.quantity,
+             f"{item.total_price:.2f}")
+            for item in order.items
+        ])
     
     def _clear_order_form(self):
         """Очистка формы заказа."""
         self.current_order = None
         self.current_customer = None
-        self.order_items = []
         
         self.order_customer_label.config(text="Не выбран")
-        self.order_date_label.config(text=datetime.now().strftime("%Y-%m-%d %H:%M"))
+        self.order_date_label.config(text=datetime.now().strftime(DATE_FORMAT))
         self.order_total_label.config(text="0.00")
         self.order_items_tree.delete(*self.order_items_tree.get_children())
     
@@ -745,15 +1098,13 @@ class OrderManagementApp:
             return
         
         # Генерация ID для нового заказа
-        orders = self.db.get_all_orders()
-        new_id = max([o.order_id for o in orders], default=0) + 1
+        new_id = self.db.get_next_order_id()
         
         self.current_order = Order(new_id, self.current_customer)
-        self.order_items = []
         
         # Обновление информации о заказе
         self.order_customer_label.config(text=f"{self.current_customer.name} (ID: {self.current_customer.customer_id})")
-        self.order_date_label.config(text=self.current_order.date.strftime("%Y-%m-%d %H:%M"))
+        self.order_date_label.config(text=self.current_order.date.strftime(DATE_FORMAT))
         self.order_total_label.config(text="0.00")
         self.order_items_tree.delete(*self.order_items_tree.get_children())
         
@@ -782,7 +1133,6 @@ class OrderManagementApp:
             
             item = OrderItem(product, quantity)
             self.current_order.add_item(item)
-            self.order_items.append(item)
             
             # Обновление списка товаров
             self.order_items_tree.insert("", tk.END, values=(
@@ -817,7 +1167,11 @@ class OrderManagementApp:
         self._clear_order_form()
     
     def _import_orders(self):
-        """Импорт заказов из файла."""
+        """Импорт заказов из файла.
+
+        JSON-файл читается и разбирается в фоновом потоке; сборка заказов
+        и запись в базу выполняются в главном потоке.
+        """
         file_path = filedialog.askopenfilename(
             title="Импорт заказов",
             filetypes=(("JSON files", "*.json"), ("CSV files", "*.csv")))
@@ -825,41 +1179,65 @@ class OrderManagementApp:
         if not file_path:
             return
         
-        try:
-            if file_path.endswith('.json'):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                for order_data in data:
-                    customer = self.db.get_customer(order_data['customer_id'])
-                    if not customer:
-                        continue
-                    
-                    order = Order(
-                        order_data['order_id'],
-                        customer,
-                        datetime.fromisoformat(order_data['date'])
-                    )
-                    
-                    for item_data in order_data['items']:
-                        product = self.db.get_product(item_data['product_id'])
-                        if product:
-                            order.add_item(OrderItem(product, item_data['quantity']))
-                    
-                    self.db.add_order(order)
+        if file_path.endswith('.csv'):
+            # Для CSV потребуется более сложная логика из-за структуры заказов
+            messagebox.showwarning("Внимание", "Импорт заказов из CSV требует специального формата")
+            return
+        
+        if not file_path.endswith('.json'):
+            messagebox.showinfo("Успех", "Заказы успешно импортированы")
+            return
+        
+        self._run_in_background(
+            lambda: self._read_json_file(file_path),
+            self._finish_import_orders,
+            "Ошибка импорта"
+        )
+    
+    @staticmethod
+    def _read_json_file(file_path: str) -> Any:
+        """Чтение и разбор JSON-файла (без обращения к виджетам)."""
+        with open(file_path, 'rb') as f:
+            return json_loads(f.read())
+    
+    def _finish_import_orders(self, data: List[Dict]):
+        """Сохранение импортированных заказов и обновление таблицы."""
+        # Клиенты и товары ищутся по словарям из снимков; методы,
+        # вызываемые в цикле, связываются с локальными именами
+        self._get_customers()
+        get_customer = self._customers_by_id.get
+        get_product = {p.product_id: p for p in self._get_products()}.get
+        parse_date = datetime.fromisoformat
+        
+        orders = []
+        add_order = orders.append
+        for order_data in data:
+            customer = get_customer(order_data['customer_id'])
+            if not customer:
+                continue
             
-            elif file_path.endswith('.csv'):
-                # Для CSV потребуется более сложная логика из-за структуры заказов
-                messagebox.showwarning("Внимание", "Импорт заказов из CSV требует специального формата")
-                return
+            order = Order(
+                order_data['order_id'],
+                customer,
+                parse_date(order_data['date'])
+            )
+            add_item = order.add_item
             
-            self._update_order_list()
-            messagebox.showinfo("Успех", "Заказы успешно импортированы")
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Ошибка импорта: {e}")
+            for item_data in order_data['items']:
+                product = get_product(item_data['product_id'])
+                if product:
+                    add_item(OrderItem(product, item_data['quantity']))
+            
+            add_order(order)
+        
+        # Все заказы записываются одним пакетом: либо все, либо ни одного
+        self.db.add_orders_bulk(orders)
+        
+        self._update_order_list()
+        messagebox.showinfo("Успех", "Заказы успешно импортированы")
     
     def _export_orders(self):
-        """Экспорт заказов в файл."""
+        """Экспорт заказов в файл (запись файла — в фоновом потоке)."""
         file_path = filedialog.asksaveasfilename(
             title="Экспорт заказов",
             defaultextension=".json",
@@ -868,89 +1246,95 @@ class OrderManagementApp:
         if not file_path:
             return
         
-        try:
-            orders = self.db.get_all_orders()
-            data = [order.to_dict() for order in orders]
-            
-            if file_path.endswith('.json'):
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=4, ensure_ascii=False)
-            
-            elif file_path.endswith('.csv'):
-                # Для CSV потребуется более сложная логика из-за структуры заказов
-                messagebox.showwarning("Внимание", "Экспорт заказов в CSV будет ограниченным")
-                
-                with open(file_path, 'w', encoding='utf-8', newline='') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(['order_id', 'customer_id', 'date', 'total_amount'])
-                    for order in orders:
-                        writer.writerow([
-                            order.order_id,
-                            order.customer.customer_id,
-                            order.date.isoformat(),
-                            order.total_amount
-                        ])
-            
-            messagebox.showinfo("Успех", "Заказы успешно экспортированы")
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Ошибка экспорта: {e}")
+        if file_path.endswith('.csv'):
+            # Для CSV потребуется более сложная логика из-за структуры заказов
+            messagebox.showwarning("Внимание", "Экспорт заказов в CSV будет ограниченным")
+        
+        # Снимок заказов берётся в главном потоке, фоновый поток только пишет
+        # файл: Database не потокобезопасна (кэш файлов и индексы меняются при
+        # чтении), поэтому обход db.iter_orders() из фонового потока мог бы
+        # пересечься с записью из главного. Снимок при изменении базы
+        # заменяется новым списком, а не изменяется, так что его можно читать
+        # из фонового потока.
+        orders = self._get_orders()
+        self._run_in_background(
+            lambda: self._write_orders(file_path, orders),
+            lambda _: messagebox.showinfo("Успех", "Заказы успешно экспортированы"),
+            "Ошибка экспорта"
+        )
+    
+    @staticmethod
+    def _write_orders(file_path: str, orders: Iterable[Order]):
+        """Запись заказов в JSON или CSV файл по расширению.
+
+        В JSON заказы сериализуются по одному, без общего списка словарей;
+        в CSV пишутся только итоговые поля заказа без позиций.
+        """
+        if file_path.endswith('.json'):
+            OrderManagementApp._write_records(
+                file_path, (order.to_dict() for order in orders), ())
+        
+        elif file_path.endswith('.csv'):
+            with open(file_path, 'w', encoding='utf-8', newline='',
+                      buffering=1 << 20) as f:
+                writer = csv.writer(f)
+                writer.writerow(['order_id', 'customer_id', 'date', 'total_amount'])
+                writer.writerows(
+                    (order.order_id, order.customer.customer_id,
+                     order.date.isoformat(), order.total_amount)
+                    for order in orders
+                )
     
     # Методы для анализа данных
+    def _show_figure(self, fig: Figure):
+        """Отображение графика анализатора на вкладке анализа.
+
+        Анализатор перерисовывает одну и ту же фигуру, поэтому холст Tk
+        создаётся один раз и при следующих вызовах только обновляется.
+        Анализатор задаёт фигуре размер графика, а виджет свой размер не
+        меняет, поэтому перед отрисовкой фигура подгоняется под виджет.
+        """
+        if self._analysis_canvas is None or self._analysis_canvas.figure is not fig:
+            if self._analysis_canvas is not None:
+                self._analysis_canvas.get_tk_widget().destroy()
+            self._analysis_canvas = FigureCanvasTkAgg(fig, master=self.analysis_frame)
+            self._analysis_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        else:
+            widget = self._analysis_canvas.get_tk_widget()
+            width, height = widget.winfo_width(), widget.winfo_height()
+            if width > 1 and height > 1:
+                fig.set_size_inches(width / fig.dpi, height / fig.dpi, forward=False)
+                fig.tight_layout()
+        self._analysis_canvas.draw_idle()
+    
     def _show_top_customers(self):
         """Показать топ клиентов по количеству заказов."""
-        for widget in self.analysis_frame.winfo_children():
-            widget.destroy()
-        
-        fig = self.analyzer.plot_top_customers()
-        canvas = FigureCanvasTkAgg(fig, master=self.analysis_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self._show_figure(self.analyzer.plot_top_customers())
     
     def _show_sales_trend(self):
         """Показать динамику продаж."""
-        for widget in self.analysis_frame.winfo_children():
-            widget.destroy()
-        
-        fig = self.analyzer.plot_sales_trend()
-        canvas = FigureCanvasTkAgg(fig, master=self.analysis_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self._show_figure(self.analyzer.plot_sales_trend())
     
     def _show_top_products(self):
         """Показать топ товаров по продажам."""
-        for widget in self.analysis_frame.winfo_children():
-            widget.destroy()
-        
-        fig = self.analyzer.plot_top_products()
-        canvas = FigureCanvasTkAgg(fig, master=self.analysis_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self._show_figure(self.analyzer.plot_top_products())
     
     def _show_customer_graph(self):
         """Показать граф связей клиентов."""
-        for widget in self.analysis_frame.winfo_children():
-            widget.destroy()
-        
-        fig = self.analyzer.plot_customer_graph()
-        canvas = FigureCanvasTkAgg(fig, master=self.analysis_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self._show_figure(self.analyzer.plot_customer_graph())
     
     # Методы администрирования
     def _update_stats(self):
         """Обновление статистики."""
-        customers = self.db.get_all_customers()
-        products = self.db.get_all_products()
-        orders = self.db.get_all_orders()
-        total_revenue = sum(order.total_amount for order in orders)
+        stats = self.db.get_stats()
         
-        self.customer_count_label.config(text=str(len(customers)))
-        self.product_count_label.config(text=str(len(products)))
-        self.order_count_label.config(text=str(len(orders)))
-        self.total_revenue_label.config(text=f"{total_revenue:.2f}")
+        self.customer_count_label.config(text=str(stats['customers']))
+        self.product_count_label.config(text=str(stats['products']))
+        self.order_count_label.config(text=str(stats['orders']))
+        self.total_revenue_label.config(text=f"{stats['revenue']:.2f}")
     
     def _export_full_db(self):
-        """Экспорт всей базы данных в JSON."""
+        """Экспорт всей базы данных в JSON (в фоновом потоке)."""
         file_path = filedialog.asksaveasfilename(
             title="Экспорт всей базы данных",
             defaultextension=".json",
@@ -959,14 +1343,22 @@ class OrderManagementApp:
         if not file_path:
             return
         
-        try:
-            self.db.export_to_json(file_path)
-            messagebox.showinfo("Успех", "База данных успешно экспортирована")
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Ошибка экспорта: {e}")
+        # Database не потокобезопасна, а главный поток может переписать файлы
+        # базы во время экспорта. Поэтому строки файлов читаются здесь, а
+        # фоновый поток только склеивает их и пишет файл экспорта.
+        records = self.db.read_raw_records()
+        self._run_in_background(
+            lambda: Database.write_json_export(file_path, records),
+            lambda _: messagebox.showinfo("Успех", "База данных успешно экспортирована"),
+            "Ошибка экспорта"
+        )
     
     def _import_full_db(self):
-        """Импорт всей базы данных из JSON."""
+        """Импорт всей базы данных из JSON.
+
+        Файл разбирается в фоновом потоке, запись в базу выполняется
+        в главном потоке.
+        """
         file_path = filedialog.askopenfilename(
             title="Импорт всей базы данных",
             filetypes=(("JSON files", "*.json"),))
@@ -974,16 +1366,21 @@ class OrderManagementApp:
         if not file_path:
             return
         
-        try:
-            self.db.import_from_json(file_path)
-            self._update_customer_list()
-            self._update_product_list()
-            self._update_order_list()
-            self._update_product_combobox()
-            self._update_stats()
-            messagebox.showinfo("Успех", "База данных успешно импортирована")
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Ошибка импорта: {e}")
+        self._run_in_background(
+            lambda: self._read_json_file(file_path),
+            self._finish_import_full_db,
+            "Ошибка импорта"
+        )
+    
+    def _finish_import_full_db(self, data: Dict[str, List[Dict]]):
+        """Запись импортированной базы и обновление всех вкладок."""
+        self.db.import_data(data)
+        self._update_customer_list()
+        self._update_product_list()
+        self._update_order_list()
+        self._update_product_combobox()
+        self._update_stats()
+        messagebox.showinfo("Успех", "База данных успешно импортирована")
     
     def _export_full_db_csv(self):
         """Экспорт всей базы данных в CSV."""
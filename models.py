@@ -12,9 +12,15 @@ import re
 from datetime import datetime
 from typing import List, Dict, Optional
 
+# Регулярные выражения для проверки контактных данных
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_PHONE_RE = re.compile(r'^(\+7|8|7)?[\s\-]?\(?[489][0-9]{2}\)?[\s\-]?[0-9]{3}[\s\-]?[0-9]{2}[\s\-]?[0-9]{2}$')
+
 class Person:
     """Базовый класс для представления персоны."""
     
+    __slots__ = ('name', '_email', '_phone', 'address')
+    
     def __init__(self, name: str, email: str, phone: str, address: str):
         """Parameters.
 
@@ -58,6 +64,9 @@ class Person:
         ValueError
             Если email невалиден.
         """
+        # Повторное присваивание уже проверенного значения не валидируется
+        if value == getattr(self, '_email', None):
+            return
         if not self.validate_email(value):
             raise ValueError("Неверный формат email")
         self._email = value
@@ -87,6 +96,8 @@ class Person:
         ValueError
             Если номер телефона невалиден.
         """    
+        if value == getattr(self, '_phone', None):
+            return
         if not self.validate_phone(value):
             raise ValueError("Неверный формат телефона")
         self._phone = value
@@ -94,14 +105,12 @@ class Person:
     @staticmethod
     def validate_email(email: str) -> bool:
         """Проверка email с помощью регулярного выражения."""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(pattern, email) is not None
+        return _EMAIL_RE.match(email) is not None
     
     @staticmethod
     def validate_phone(phone: str) -> bool:
         """Проверка телефона с помощью регулярного выражения."""
-        pattern = r'^(\+7|8|7)?[\s\-]?\(?[489][0-9]{2}\)?[\s\-]?[0-9]{3}[\s\-]?[0-9]{2}[\s\-]?[0-9]{2}$'
-        return re.match(pattern, phone) is not None
+        return _PHONE_RE.match(phone) is not None
     
     def to_dict(self) -> Dict:
         """Преобразование объекта в словарь."""
@@ -116,6 +125,8 @@ class Person:
 class Customer(Person):
     """Класс для представления клиента."""
     
+    __slots__ = ('customer_id', 'orders')
+    
     def __init__(self, customer_id: int, name: str, email: str, phone: str, address: str):
         """Parameters.
 
@@ -146,6 +157,8 @@ class Customer(Person):
 class Product:
     """Класс для представления товара."""
     
+    __slots__ = ('product_id', 'name', 'price', 'category', 'stock')
+    
     def __init__(self, product_id: int, name: str, price: float, category: str, stock: int = 0):
         """Parameters.
 
@@ -186,6 +199,8 @@ class Product:
 class OrderItem:
     """Класс для представления позиции в заказе."""
     
+    __slots__ = ('product', 'quantity', 'price', 'total_price')
+    
     def __init__(self, product: Product, quantity: int):
         """Parameters.
 
@@ -198,11 +213,8 @@ class OrderItem:
         self.product = product
         self.quantity = quantity
         self.price = product.price
-    
-    @property
-    def total_price(self) -> float:
-        """Общая стоимость позиции."""
-        return self.price * self.quantity
+        # Общая стоимость позиции
+        self.total_price = self.price * quantity
     
     def to_dict(self) -> Dict:
         """Преобразование объекта в словарь."""
@@ -216,6 +228,8 @@ class OrderItem:
 class Order:
     """Класс для представления заказа."""
     
+    __slots__ = ('order_id', 'customer', 'date', 'items', '_total')
+    
     def __init__(self, order_id: int, customer: Customer, date: Optional[datetime] = None):
         """Parameters.
 
@@ -231,15 +245,17 @@ class Order:
         self.customer = customer
         self.date = date if date else datetime.now()
         self.items: List[OrderItem] = []
+        self._total = 0.0
     
     def add_item(self, item: OrderItem):
         """Добавление позиции в заказ."""
         self.items.append(item)
+        self._total += item.total_price
     
     @property
     def total_amount(self) -> float:
-        """Общая сумма заказа."""
-        return sum(item.total_price for item in self.items)
+        """Общая сумма заказа (накапливается в add_item)."""
+        return self._total
     
     def to_dict(self) -> Dict:
         """Преобразование объекта в словарь."""
@@ -2,11 +2,14 @@
 Unit-тесты для модуля analysis.py.
 """
 import unittest
+import warnings
 import sys
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from unittest.mock import Mock, MagicMock
 
+import pandas as pd
+
 # Добавляем путь к текущей директории для импорта модулей
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -56,6 +59,10 @@ class TestDataAnalyzer(unittest.TestCase):
             self.product1, self.product2, self.product3
         ]
         
+        # Анализатор обходит заказы через iter_orders
+        self.mock_db.iter_orders.side_effect = (
+            lambda: iter(self.mock_db.get_all_orders.return_value))
+        
         self.analyzer = DataAnalyzer(self.mock_db)
     
     def test_get_top_customers(self):
@@ -78,6 +85,21 @@ class TestDataAnalyzer(unittest.TestCase):
         self.assertEqual(petr_stats[1], 1)  # 1 заказ
         self.assertAlmostEqual(petr_stats[2], 11500.0)  # 10000 + 1500
         
+    def test_get_top_products(self):
+        """Тест получения топ товаров."""
+        top_products = self.analyzer.get_top_products(2)
+        
+        self.assertEqual(len(top_products), 2)
+        
+        # Книга - 4 шт., телефон - 3 шт.
+        self.assertEqual(top_products[0][0].product_id, 3)
+        self.assertEqual(top_products[0][1], 4)
+        self.assertAlmostEqual(top_products[0][2], 2000.0)
+        
+        self.assertEqual(top_products[1][0].product_id, 1)
+        self.assertEqual(top_products[1][1], 3)
+        self.assertAlmostEqual(top_products[1][2], 30000.0)
+        
     def test_get_top_products_empty(self):
         """Тест получения топ товаров при пустой базе."""
         self.mock_db.get_all_orders.return_value = []
@@ -103,7 +125,14 @@ class TestDataAnalyzer(unittest.TestCase):
             for id1, id2, weight in edges
         )
         self.assertTrue(connection_found)
-    
+
+    def test_get_customer_connections_weight(self):
+        """Тест веса связи по числу общих товаров."""
+        connections = self.analyzer.get_customer_connections()
+
+        # Иван и Петр покупали телефон и книгу, Сидор ничего не покупал
+        self.assertEqual(connections['edges'], [(1, 2, 2)])
+
     def test_get_customer_connections_no_common(self):
         """Тест связей когда нет общих товаров."""
         # Создаем заказы без общих товаров
@@ -126,6 +155,75 @@ class TestDataAnalyzer(unittest.TestCase):
         
         # Проверяем что данные не пустые
         self.assertFalse(trend.empty)
+    
+    def test_get_sales_trend_empty(self):
+        """Тест динамики продаж при отсутствии заказов."""
+        self.mock_db.get_all_orders.return_value = []
+        
+        trend = self.analyzer.get_sales_trend('W')
+        self.assertTrue(trend.empty)
+        self.assertEqual(list(trend.columns), ['date', 'orders_count', 'total_amount'])
+
+    def test_get_sales_trend_keeps_local_day(self):
+        """Тест разбиения по дням для дат с часовым поясом."""
+        msk = timezone(timedelta(hours=3))
+        order = Order(4, self.customer1, datetime(2025, 1, 1, 1, 30, tzinfo=msk))
+        order.add_item(OrderItem(self.product3, 1))
+        self.mock_db.get_all_orders.return_value = [order]
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            trend = self.analyzer.get_sales_trend('D')
+
+        self.assertEqual(list(trend['date']), [pd.Timestamp(2025, 1, 1)])
+        self.assertEqual(list(trend['orders_count']), [1])
+
+    def test_results_cached_until_data_changes(self):
+        """Тест кэширования результатов до изменения версии данных."""
+        self.mock_db.get_data_version.return_value = (1, 1, 1)
+
+        first = self.analyzer.get_top_customers(2)
+        self.assertIs(self.analyzer.get_top_customers(2), first)
+        self.assertEqual(self.mock_db.iter_orders.call_count, 1)
+
+        # Новая версия данных сбрасывает кэш
+        self.mock_db.get_data_version.return_value = (1, 1, 2)
+        self.mock_db.get_all_orders.return_value = []
+
+        top_customers = self.analyzer.get_top_customers(2)
+        self.assertEqual([cnt for c, cnt, amt in top_customers], [0, 0])
+
+    def test_orders_read_once_per_version(self):
+        """Тест однократного чтения заказов всеми методами анализа."""
+        self.mock_db.get_data_version.return_value = (1, 1, 1)
+
+        self.analyzer.get_top_customers()
+        self.analyzer.get_top_products()
+        self.analyzer.get_sales_trend('D')
+        self.analyzer.get_customer_connections()
+        self.assertEqual(self.mock_db.iter_orders.call_count, 1)
+
+    def test_plots_reuse_figure(self):
+        """Тест переиспользования одной фигуры всеми графиками."""
+        fig = self.analyzer.plot_top_customers()
+        self.assertEqual(len(fig.axes), 2)
+
+        self.assertIs(self.analyzer.plot_customer_graph(), fig)
+        self.assertEqual(len(fig.axes), 1)
+
+    def test_plot_not_redrawn_for_same_data(self):
+        """Тест повторного показа графика без перерисовки."""
+        self.mock_db.get_data_version.return_value = (1, 1, 1)
+        fig = self.analyzer.plot_top_products()
+        axes = fig.axes
+
+        self.assertIs(self.analyzer.plot_top_products(), fig)
+        self.assertEqual(fig.axes, axes)
+
+        # После изменения данных график строится заново
+        self.mock_db.get_data_version.return_value = (1, 1, 2)
+        self.analyzer.plot_top_products()
+        self.assertNotEqual(fig.axes, axes)
 
 class TestDataAnalyzerEdgeCases(unittest.TestCase):
     """Тесты для крайних случаев DataAnalyzer."""
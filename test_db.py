@@ -0,0 +1,298 @@
+"""
+Unit-тесты для модуля db.py.
+"""
+import unittest
+import os
+import json
+import tempfile
+from datetime import datetime
+from unittest.mock import patch
+
+from db import Database
+from models import Customer, Product, Order, OrderItem
+
+class TestDatabaseCache(unittest.TestCase):
+    """Тесты для кэширования чтения файлов в Database."""
+
+    def setUp(self):
+        """Создание базы во временной папке."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_repeated_load_uses_cache(self):
+        """Тест повторного чтения неизменённого файла из кэша."""
+        first = self.db._load_data(self.db.customers_file)
+        second = self.db._load_data(self.db.customers_file)
+        self.assertIs(first, second)
+
+    def test_save_updates_cache(self):
+        """Тест обновления кэша после записи."""
+        self.db.add_customer(Customer(1, "Test", "test@mail.com", "+79161234567", "Address"))
+
+        customers = self.db.get_all_customers()
+        self.assertEqual(len(customers), 1)
+        self.assertEqual(customers[0].name, "Test")
+
+    def test_external_change_invalidates_cache(self):
+        """Тест сброса кэша при изменении файла извне."""
+        self.db._load_data(self.db.products_file)
+
+        with open(self.db.products_file, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'product_id': 1, 'name': 'P', 'price': 1.0,
+                                'category': 'C', 'stock': 1}) + '\n')
+        # Гарантируем отличие mtime даже на файловых системах с грубым разрешением
+        stat = os.stat(self.db.products_file)
+        os.utime(self.db.products_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        products = self.db.get_all_products()
+        self.assertEqual(len(products), 1)
+
+    def test_add_appends_line(self):
+        """Тест дозаписи клиента отдельной строкой в конец файла."""
+        self.db.add_customer(Customer(1, "Test", "test@mail.com", "+79161234567", "Address"))
+        self.db.add_customer(Customer(2, "Test 2", "test2@mail.com", "+79161234568", "Address"))
+
+        with open(self.db.customers_file, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertEqual([json.loads(line)['customer_id'] for line in lines], [1, 2])
+        self.assertEqual([c.customer_id for c in Database(self.tmp_dir.name).get_all_customers()],
+                         [1, 2])
+
+    def test_add_customers_bulk(self):
+        """Тест пакетного добавления клиентов."""
+        customers = [
+            Customer(i, f"Test {i}", f"test{i}@mail.com", "+79161234567", "Address")
+            for i in range(1, 4)
+        ]
+        self.db.add_customers_bulk(customers)
+        self.assertEqual([c.customer_id for c in self.db.get_all_customers()], [1, 2, 3])
+
+        # Повтор ID в пакете отменяет добавление всего пакета
+        with self.assertRaises(ValueError):
+            self.db.add_customers_bulk([
+                Customer(4, "Test 4", "test4@mail.com", "+79161234567", "Address"),
+                Customer(4, "Test 4", "test4@mail.com", "+79161234567", "Address")
+            ])
+        self.assertEqual(len(self.db.get_all_customers()), 3)
+
+    def test_legacy_json_migrated(self):
+        """Тест переноса данных из файлов прежнего JSON-формата."""
+        with tempfile.TemporaryDirectory() as legacy_dir:
+            with open(os.path.join(legacy_dir, 'products.json'), 'w', encoding='utf-8') as f:
+                json.dump([{'product_id': 1, 'name': 'P', 'price': 1.0,
+                            'category': 'C', 'stock': 1}], f)
+
+            db = Database(legacy_dir)
+            self.assertEqual(db.get_product(1).name, 'P')
+            self.assertEqual(db.get_all_customers(), [])
+
+    def test_index_rebuilt_after_save(self):
+        """Тест перестроения индекса по ID после записи."""
+        self.assertIsNone(self.db.get_customer(1))
+        index = self.db._get_index(self.db.customers_file, 'customer_id')
+        self.assertIs(index, self.db._get_index(self.db.customers_file, 'customer_id'))
+
+        self.db.add_customer(Customer(1, "Test", "test@mail.com", "+79161234567", "Address"))
+
+        self.assertEqual(self.db.get_customer(1).name, "Test")
+        with self.assertRaises(ValueError):
+            self.db.add_customer(Customer(1, "Test", "test@mail.com", "+79161234567", "Address"))
+
+    def test_data_version_changes_within_mtime_tick(self):
+        """Тест смены версии данных при записи с тем же mtime файла."""
+        self.db.add_product(Product(1, "P", 1.0, "C", 10))
+        stat = os.stat(self.db.products_file)
+        version = self.db.get_data_version()
+
+        # Размер файла не меняется, mtime восстанавливается
+        self.db.update_product_stock(1, 1)
+        os.utime(self.db.products_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        self.assertEqual(os.stat(self.db.products_file).st_size, stat.st_size)
+        self.assertNotEqual(self.db.get_data_version(), version)
+
+    def test_missing_file_returns_empty(self):
+        """Тест чтения удалённого файла."""
+        self.db._load_data(self.db.orders_file)
+        os.remove(self.db.orders_file)
+        self.assertEqual(self.db._load_data(self.db.orders_file), [])
+
+class TestDatabaseOrders(unittest.TestCase):
+    """Тесты для чтения заказов из Database."""
+
+    def setUp(self):
+        """Создание базы с двумя клиентами, товарами и заказами."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db = Database(self.tmp_dir.name)
+
+        self.customer1 = Customer(1, "Иван Иванов", "ivan@mail.com", "+79161234567", "Москва")
+        self.customer2 = Customer(2, "Петр Петров", "petr@mail.com", "+79169876543", "СПб")
+        self.product1 = Product(1, "Телефон", 10000.0, "Электроника", 10)
+        self.product2 = Product(2, "Книга", 500.0, "Книги", 20)
+
+        for customer in (self.customer1, self.customer2):
+            self.db.add_customer(customer)
+        for product in (self.product1, self.product2):
+            self.db.add_product(product)
+
+        order1 = Order(1, self.customer1, datetime(2025, 1, 1))
+        order1.add_item(OrderItem(self.product1, 2))
+        order1.add_item(OrderItem(self.product2, 1))
+        self.db.add_order(order1)
+
+        order2 = Order(2, self.customer2, datetime(2025, 1, 2))
+        order2.add_item(OrderItem(self.product2, 3))
+        self.db.add_order(order2)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_get_all_orders(self):
+        """Тест получения всех заказов."""
+        orders = self.db.get_all_orders()
+
+        self.assertEqual([o.order_id for o in orders], [1, 2])
+        self.assertEqual(orders[0].customer.customer_id, 1)
+        self.assertEqual(len(orders[0].items), 2)
+        self.assertAlmostEqual(orders[0].total_amount, 20500.0)
+        self.assertAlmostEqual(orders[1].total_amount, 1500.0)
+
+    def test_get_order_matches_get_all_orders(self):
+        """Тест совпадения get_order и get_all_orders."""
+        for order in self.db.get_all_orders():
+            single = self.db.get_order(order.order_id)
+            self.assertEqual(single.to_dict(), order.to_dict())
+
+    def test_iter_orders_streams_file(self):
+        """Тест построчного обхода заказов без заполнения кэша."""
+        expected = [o.to_dict() for o in self.db.get_all_orders()]
+        self.db._cache.pop(self.db.orders_file)
+
+        self.assertEqual([o.to_dict() for o in self.db.iter_orders()], expected)
+        self.assertNotIn(self.db.orders_file, self.db._cache)
+
+    def test_add_order_updates_stock(self):
+        """Тест списания товаров со склада при добавлении заказа."""
+        self.assertEqual(self.db.get_product(1).stock, 8)
+        self.assertEqual(self.db.get_product(2).stock, 16)
+
+        order = Order(3, self.customer1, datetime(2025, 1, 3))
+        order.add_item(OrderItem(self.product1, 5))
+        order.add_item(OrderItem(self.product1, 5))
+        self.db.add_order(order)
+
+        self.assertEqual(self.db.get_product(1).stock, 0)
+        self.assertEqual(self.db.get_product(2).stock, 16)
+
+    def test_add_orders_bulk(self):
+        """Тест пакетного добавления заказов."""
+        order3 = Order(3, self.customer1, datetime(2025, 1, 3))
+        order3.add_item(OrderItem(self.product2, 4))
+        order4 = Order(4, self.customer2, datetime(2025, 1, 4))
+        order4.add_item(OrderItem(self.product2, 6))
+        self.db.add_orders_bulk([order3, order4])
+
+        self.assertEqual([o.order_id for o in self.db.get_all_orders()], [1, 2, 3, 4])
+        self.assertEqual(self.db.get_product(2).stock, 6)
+
+    def test_add_orders_bulk_rejects_duplicates(self):
+        """Тест отказа пакетного добавления при повторе ID."""
+        order3 = Order(3, self.customer1, datetime(2025, 1, 3))
+        order3.add_item(OrderItem(self.product2, 4))
+
+        with self.assertRaises(ValueError):
+            self.db.add_orders_bulk([order3, Order(3, self.customer2)])
+        with self.assertRaises(ValueError):
+            self.db.add_orders_bulk([order3, Order(1, self.customer2)])
+
+        self.assertEqual(len(self.db.get_all_orders()), 2)
+        self.assertEqual(self.db.get_product(2).stock, 16)
+
+    def test_get_stats(self):
+        """Тест сводной статистики и её обновления после записи."""
+        stats = self.db.get_stats()
+        self.assertEqual((stats['customers'], stats['products'], stats['orders']), (2, 2, 2))
+        self.assertAlmostEqual(stats['revenue'],
+                               sum(o.total_amount for o in self.db.get_all_orders()))
+        self.assertIs(self.db.get_stats(), stats)
+
+        order3 = Order(3, self.customer2, datetime(2025, 1, 3))
+        order3.add_item(OrderItem(self.product1, 1))
+        self.db.add_order(order3)
+
+        stats = self.db.get_stats()
+        self.assertEqual(stats['orders'], 3)
+        self.assertAlmostEqual(stats['revenue'], 32000.0)
+
+    def test_get_next_order_id(self):
+        """Тест выбора ID для нового заказа."""
+        self.assertEqual(self.db.get_next_order_id(), 3)
+
+        self.db.add_order(Order(10, self.customer1, datetime(2025, 1, 3)))
+        self.assertEqual(self.db.get_next_order_id(), 11)
+
+    def test_get_next_order_id_no_rescan_after_add(self):
+        """Тест продвижения следующего ID без повторного обхода заказов."""
+        self.assertEqual(self.db.get_next_order_id(), 3)
+        self.db.add_order(Order(7, self.customer1, datetime(2025, 1, 3)))
+
+        with patch.object(self.db, '_load_data', wraps=self.db._load_data) as load:
+            self.assertEqual(self.db.get_next_order_id(), 8)
+        load.assert_not_called()
+
+    def test_get_next_order_id_same_mtime(self):
+        """Тест сброса следующего ID при записи с тем же mtime файла."""
+        stat = os.stat(self.db.orders_file)
+        self.assertEqual(self.db.get_next_order_id(), 3)
+
+        self.db.add_order(Order(3, self.customer1, datetime(2025, 1, 3)))
+        # Запись в пределах одного такта времени модификации файла
+        os.utime(self.db.orders_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        self.assertEqual(self.db.get_next_order_id(), 4)
+
+    def test_get_order_missing(self):
+        """Тест получения несуществующего заказа."""
+        self.assertIsNone(self.db.get_order(99))
+
+    def test_export_import_json_roundtrip(self):
+        """Тест экспорта в JSON и обратного импорта."""
+        export_path = os.path.join(self.tmp_dir.name, 'export.json')
+        self.db.export_to_json(export_path)
+
+        with open(export_path, encoding='utf-8') as f:
+            data = json.load(f)
+        self.assertEqual([c['customer_id'] for c in data['customers']], [1, 2])
+        self.assertEqual([o['order_id'] for o in data['orders']], [1, 2])
+
+        with tempfile.TemporaryDirectory() as other_dir:
+            other = Database(other_dir)
+            other.import_from_json(export_path)
+            self.assertEqual([o.to_dict() for o in other.get_all_orders()],
+                             [o.to_dict() for o in self.db.get_all_orders()])
+
+    def test_export_to_csv_keeps_cache_and_version(self):
+        """Тест экспорта в CSV без изменения кэша и версии данных."""
+        version = self.db.get_data_version()
+        export_dir = os.path.join(self.tmp_dir.name, 'exports')
+        self.db.export_to_csv(export_dir)
+
+        self.assertTrue(os.path.exists(os.path.join(export_dir, 'orders.csv')))
+        self.assertEqual(self.db.get_data_version(), version)
+        self.assertFalse(any(path.suffix == '.csv' for path in self.db._cache))
+
+    def test_order_with_unknown_customer_skipped(self):
+        """Тест пропуска заказа с неизвестным клиентом."""
+        orders = self.db._load_data(self.db.orders_file)
+        orders.append({'order_id': 3, 'customer_id': 42,
+                       'date': datetime(2025, 1, 3).isoformat(), 'items': []})
+        self.db._save_data(orders, self.db.orders_file)
+
+        self.assertEqual(len(self.db.get_all_orders()), 2)
+        self.assertIsNone(self.db.get_order(3))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,9 @@ import unittest
 from datetime import datetime
 from models import Person, Customer, Product, OrderItem, Order
 
+# Фиксированная дата для заказов, в которых дата не проверяется
+ORDER_DATE = datetime(2025, 1, 1)
+
 class TestPerson(unittest.TestCase):
     """Тесты для класса Person."""
     
@@ -21,15 +24,21 @@ class TestPerson(unittest.TestCase):
         """Тест валидации email."""
         person = Person("Test", "test@mail.com", "+79161234567", "Address")
         
-        # Valid emails
-        self.assertTrue(Person.validate_email("test@mail.com"))
-        self.assertTrue(Person.validate_email("test.name@mail.ru"))
-        self.assertTrue(Person.validate_email("test123@domain.org"))
-        
-        # Invalid emails
-        self.assertFalse(Person.validate_email("invalid"))
-        self.assertFalse(Person.validate_email("invalid@"))
-        self.assertFalse(Person.validate_email("@mail.com"))
+        # Все значения проверяются циклом в одном тесте (subTest сообщает
+        # о каждом отдельно), а не отдельными тестами на каждое значение
+        cases = (
+            # Valid emails
+            ("test@mail.com", True),
+            ("test.name@mail.ru", True),
+            ("test123@domain.org", True),
+            # Invalid emails
+            ("invalid", False),
+            ("invalid@", False),
+            ("@mail.com", False),
+        )
+        for value, expected in cases:
+            with self.subTest(value=value):
+                self.assertEqual(Person.validate_email(value), expected)
     
     def test_phone_validation(self):
         """
@@ -47,17 +56,21 @@ class TestPerson(unittest.TestCase):
         - Пустых значений
         """
         # Тестируем различные форматы, которые допускает текущее регулярное выражение
-        self.assertTrue(Person.validate_phone("+79161234567"))  # международный формат
-        self.assertTrue(Person.validate_phone("79161234567"))   # с кодом страны
-        self.assertTrue(Person.validate_phone("9161234567"))    # простой 10-значный
-        self.assertTrue(Person.validate_phone("(916)123-4567")) # с форматированием
-        self.assertTrue(Person.validate_phone("916-123-4567"))  # с дефисами
-    
-        # Невалидные номера
-        self.assertFalse(Person.validate_phone("1234567890"))   # неправильный формат
-        self.assertFalse(Person.validate_phone("916123456"))    # меньше цифр
-        self.assertFalse(Person.validate_phone("91612345678"))  # больше цифр
-        self.assertFalse(Person.validate_phone("abc9161234567")) # содержит буквы
+        cases = (
+            ("+79161234567", True),   # международный формат
+            ("79161234567", True),    # с кодом страны
+            ("9161234567", True),     # простой 10-значный
+            ("(916)123-4567", True),  # с форматированием
+            ("916-123-4567", True),   # с дефисами
+            # Невалидные номера
+            ("1234567890", False),    # неправильный формат
+            ("916123456", False),     # меньше цифр
+            ("91612345678", False),   # больше цифр
+            ("abc9161234567", False), # содержит буквы
+        )
+        for value, expected in cases:
+            with self.subTest(value=value):
+                self.assertEqual(Person.validate_phone(value), expected)
     
     def test_email_setter_validation(self):
         """Тест валидации при установке email."""
@@ -94,27 +107,27 @@ class TestCustomer(unittest.TestCase):
     def test_add_order(self):
         """Тест добавления заказа клиенту."""
         customer = Customer(1, "Test", "test@mail.com", "+79161234567", "Address")
-        order = Order(1, customer)
+        order = Order(1, customer, ORDER_DATE)
         
         customer.add_order(order)
         self.assertEqual(len(customer.orders), 1)
-        self.assertEqual(customer.orders[0], order)
+        self.assertIs(customer.orders[0], order)
     
     def test_get_total_spent(self):
         """Тест расчета общей суммы покупок."""
         customer = Customer(1, "Test", "test@mail.com", "+79161234567", "Address")
         product = Product(1, "Product", 100.0, "Category", 10)
         
-        order1 = Order(1, customer)
+        order1 = Order(1, customer, ORDER_DATE)
         order1.add_item(OrderItem(product, 2))  # 200
         
-        order2 = Order(2, customer)
+        order2 = Order(2, customer, ORDER_DATE)
         order2.add_item(OrderItem(product, 1))  # 100
         
         customer.add_order(order1)
         customer.add_order(order2)
         
-        self.assertEqual(customer.get_total_spent(), 300.0)
+        self.assertAlmostEqual(customer.get_total_spent(), 300.0)
 
 class TestProduct(unittest.TestCase):
     """Тесты для класса Product."""
@@ -149,7 +162,7 @@ class TestOrderItem(unittest.TestCase):
         product = Product(1, "Product", 100.0, "Category")
         item = OrderItem(product, 3)
         
-        self.assertEqual(item.product, product)
+        self.assertIs(item.product, product)
         self.assertEqual(item.quantity, 3)
         self.assertEqual(item.price, 100.0)
     
@@ -158,47 +171,51 @@ class TestOrderItem(unittest.TestCase):
         product = Product(1, "Product", 150.0, "Category")
         item = OrderItem(product, 4)
         
-        self.assertEqual(item.total_price, 600.0)  # 150 * 4
+        self.assertAlmostEqual(item.total_price, 600.0)  # 150 * 4
 
 class TestOrder(unittest.TestCase):
     """Тесты для класса Order."""
     
-    def setUp(self):
-        """Настройка тестовых данных."""
-        self.customer = Customer(1, "Test", "test@mail.com", "+79161234567", "Address")
-        self.product1 = Product(1, "Product1", 100.0, "Category1", 10)
-        self.product2 = Product(2, "Product2", 200.0, "Category2", 5)
+    @classmethod
+    def setUpClass(cls):
+        """Настройка тестовых данных, общих для всех тестов класса.
+
+        Тесты создают собственные заказы и не изменяют клиента и товары.
+        """
+        cls.customer = Customer(1, "Test", "test@mail.com", "+79161234567", "Address")
+        cls.product1 = Product(1, "Product1", 100.0, "Category1", 10)
+        cls.product2 = Product(2, "Product2", 200.0, "Category2", 5)
     
     def test_order_creation(self):
         """Тест создания объекта Order."""
         order = Order(1, self.customer)
         
         self.assertEqual(order.order_id, 1)
-        self.assertEqual(order.customer, self.customer)
+        self.assertIs(order.customer, self.customer)
         self.assertIsInstance(order.date, datetime)
         self.assertEqual(order.items, [])
     
     def test_add_item(self):
         """Тест добавления позиции в заказ."""
-        order = Order(1, self.customer)
+        order = Order(1, self.customer, ORDER_DATE)
         item = OrderItem(self.product1, 2)
         
         order.add_item(item)
         self.assertEqual(len(order.items), 1)
-        self.assertEqual(order.items[0], item)
+        self.assertIs(order.items[0], item)
     
     def test_total_amount(self):
         """Тест расчета общей суммы заказа."""
-        order = Order(1, self.customer)
+        order = Order(1, self.customer, ORDER_DATE)
         
         order.add_item(OrderItem(self.product1, 2))  # 100 * 2 = 200
         order.add_item(OrderItem(self.product2, 1))  # 200 * 1 = 200
         
-        self.assertEqual(order.total_amount, 400.0)
+        self.assertAlmostEqual(order.total_amount, 400.0)
     
     def test_empty_order_total(self):
         """Тест суммы пустого заказа."""
-        order = Order(1, self.customer)
+        order = Order(1, self.customer, ORDER_DATE)
         self.assertEqual(order.total_amount, 0.0)
 
 if __name__ == '__main__':